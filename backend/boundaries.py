@@ -0,0 +1,205 @@
+"""
+Nepal Elections 2026 - Constituency Boundaries
+Zoom-dependent simplified polygons as precompressed GeoJSON / TopoJSON
+"""
+
+from typing import Optional
+import gzip
+import hashlib
+import json
+import threading
+import compression
+import db
+
+BOUNDARY_FORMATS = "^(geojson|topojson)$"
+
+MEDIA_TYPES = {
+    "geojson": "application/geo+json",
+    "topojson": "application/json",
+}
+
+# TopoJSON quantization: grid points per axis across the whole extent
+TOPOJSON_QUANTIZATION = 100000
+
+class BoundaryPayload:
+    """One rendered level/format: raw bytes, compressed variants and ETags."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.gzip = gzip.compress(body, compresslevel=9)
+        self.etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        self._br = None
+
+    def variant(self, encoding: Optional[str]) -> tuple:
+        """
+        (body, ETag) in a content coding from compression.choose_encoding.
+
+        Each coding gets its own strong ETag, since the bytes differ. The
+        brotli body is compressed on first use (blocking; run in the
+        threadpool).
+        """
+        if encoding is None:
+            return self.body, self.etag
+        if encoding == "gzip":
+            return self.gzip, self.etag[:-1] + '-gz"'
+        if self._br is None:
+            self._br = compression.compress(self.body, "br")
+        return self._br, self.etag[:-1] + '-br"'
+
+def _features_sql(level: int) -> tuple:
+    return ("""
+        SELECT c.id, c.name, c.name_nepali, c.province, c.district, s.geojson
+        FROM constituency_shapes s
+        JOIN constituencies c ON c.id = s.constituency_id
+        WHERE s.level = %s
+        ORDER BY c.id
+    """, (level,))
+
+def _properties(row: dict) -> dict:
+    return {
+        "name": row["name"],
+        "name_nepali": row.get("name_nepali"),
+        "province": row["province"],
+        "district": row["district"],
+    }
+
+def render_geojson(rows: list) -> bytes:
+    """FeatureCollection built around the stored geometry text (not parsed)."""
+    features = ",".join(
+        '{"type":"Feature","id":%s,"properties":%s,"geometry":%s}' % (
+            json.dumps(row["id"]),
+            json.dumps(_properties(row), ensure_ascii=False, separators=(",", ":")),
+            row["geojson"],
+        )
+        for row in rows
+    )
+    return ('{"type":"FeatureCollection","features":[' + features + "]}").encode()
+
+def render_topojson(rows: list) -> bytes:
+    """
+    TopoJSON topology with quantized, delta-encoded arcs.
+
+    Each ring becomes its own arc; arcs are not shared between neighbours,
+    so the savings over GeoJSON come from quantization and delta encoding.
+    """
+    geometries = [(row, json.loads(row["geojson"])) for row in rows]
+
+    def rings(geometry):
+        polygons = geometry["coordinates"] if geometry["type"] == "MultiPolygon" else [geometry["coordinates"]]
+        for polygon in polygons:
+            yield from polygon
+
+    xs = [x for _, g in geometries for ring in rings(g) for x, _ in ring]
+    ys = [y for _, g in geometries for ring in rings(g) for _, y in ring]
+    if not xs:
+        return b'{"type":"Topology","objects":{"constituencies":{"type":"GeometryCollection","geometries":[]}},"arcs":[]}'
+
+    n = TOPOJSON_QUANTIZATION - 1
+    min_x, min_y = min(xs), min(ys)
+    kx = (max(xs) - min_x) / n or 1.0
+    ky = (max(ys) - min_y) / n or 1.0
+
+    arcs = []
+
+    def encode_ring(ring) -> int:
+        arc, px, py = [], 0, 0
+        for x, y in ring:
+            qx, qy = round((x - min_x) / kx), round((y - min_y) / ky)
+            if arc and qx == px and qy == py:
+                continue
+            arc.append([qx - px, qy - py])
+            px, py = qx, qy
+        arcs.append(arc)
+        return len(arcs) - 1
+
+    objects = []
+    for row, geometry in geometries:
+        if geometry["type"] == "MultiPolygon":
+            arc_refs = [[[encode_ring(ring)] for ring in polygon] for polygon in geometry["coordinates"]]
+        else:
+            arc_refs = [[encode_ring(ring)] for ring in geometry["coordinates"]]
+        objects.append({
+            "type": geometry["type"],
+            "id": row["id"],
+            "properties": _properties(row),
+            "arcs": arc_refs,
+        })
+
+    topology = {
+        "type": "Topology",
+        "transform": {"scale": [kx, ky], "translate": [min_x, min_y]},
+        "objects": {"constituencies": {"type": "GeometryCollection", "geometries": objects}},
+        "arcs": arcs,
+    }
+    return json.dumps(topology, ensure_ascii=False, separators=(",", ":")).encode()
+
+RENDERERS = {
+    "geojson": render_geojson,
+    "topojson": render_topojson,
+}
+
+class BoundaryCache:
+    """
+    Rendered boundary payloads keyed by (shape level, format).
+
+    Built on first request and kept until the constituencies table changes;
+    compressed bodies are computed once per payload, not per response.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._levels = None   # [(min_zoom, level)] ascending by min_zoom
+        self._payloads = {}
+        self.builds_total = 0
+
+    def _load_levels(self, cur) -> list:
+        cur.execute("SELECT level, min_zoom FROM constituency_shape_levels ORDER BY min_zoom")
+        return [(row["min_zoom"], row["level"]) for row in cur.fetchall()]
+
+    def level_for_zoom(self, zoom: int) -> int:
+        """Most detailed level whose min_zoom is at or below the zoom."""
+        if self._levels is None:
+            with db.get_db() as conn:
+                self._levels = self._load_levels(conn.cursor())
+        level = self._levels[0][1] if self._levels else 0
+        for min_zoom, candidate in self._levels:
+            if zoom >= min_zoom:
+                level = candidate
+        return level
+
+    def get(self, zoom: int, fmt: str = "geojson") -> BoundaryPayload:
+        """Payload for a map zoom level (blocking; run in the threadpool)."""
+        key = (self.level_for_zoom(zoom), fmt)
+        payload = self._payloads.get(key)
+        if payload is not None:
+            return payload
+
+        with self._lock:
+            payload = self._payloads.get(key)
+            if payload is None:
+                with db.get_db() as conn:
+                    cur = conn.cursor()
+                    cur.execute(*_features_sql(key[0]))
+                    rows = cur.fetchall()
+                payload = BoundaryPayload(RENDERERS[fmt](rows))
+                self._payloads[key] = payload
+                self.builds_total += 1
+        return payload
+
+    def on_table_changed(self, table: Optional[str]):
+        """Change-listener callback."""
+        if table in (None, "constituencies"):
+            with self._lock:
+                self._levels = None
+                self._payloads = {}
+
+    def stats(self) -> dict:
+        payloads = dict(self._payloads)
+        return {
+            "payloads": len(payloads),
+            "builds_total": self.builds_total,
+            "bytes": sum(len(p.body) for p in payloads.values()),
+            "gzip_bytes": sum(len(p.gzip) for p in payloads.values()),
+        }
+
+store = BoundaryCache()
@@ -0,0 +1,393 @@
+"""
+Nepal Elections 2026 - Bulk Event Import
+COPY-staged, diffing upsert of events, venues and tags (sql/012_bulk_import.sql)
+
+CLI:
+    python bulk_import.py events.json [--dry-run]
+    python bulk_import.py events.csv
+    python bulk_import.py - < events.json
+"""
+
+from typing import Optional
+import argparse
+import csv
+import io
+import json
+import sys
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Upper bound on events per import request
+MAX_EVENTS = 20000
+
+# Problems listed in a rejection before the rest are summarized
+MAX_PROBLEMS = 50
+
+# Staging columns, in COPY order
+STAGING_COLUMNS = (
+    "id", "title", "title_nepali", "party_id", "constituency_id", "event_type",
+    "status", "description", "datetime", "end_time", "speakers",
+    "expected_attendance", "tags", "venue_name", "venue_name_nepali",
+    "venue_address", "venue_lat", "venue_lng",
+)
+
+# CSV is the events.json shape flattened, with the same column names as
+# GET /events/export?format=csv (plus description / venue_name_nepali), so
+# an export can be edited and re-imported. Lists are "; "-separated.
+CSV_ALIASES = {
+    "type": "event_type",
+    "lat": "venue_lat",
+    "lng": "venue_lng",
+}
+
+class ImportRejected(Exception):
+    """Input that can't be imported; nothing was written."""
+
+    def __init__(self, problems: list):
+        self.problems = problems
+        super().__init__(f"{len(problems)} problem(s) in import")
+
+# ============================================================================
+# PARSING
+# ============================================================================
+
+def _from_json_event(event: dict) -> dict:
+    """One events.json entry -> staging record."""
+    venue = event.get("venue") or {}
+    coordinates = venue.get("coordinates") or [None, None]
+    return {
+        "id": event.get("id"),
+        "title": event.get("title"),
+        "title_nepali": event.get("titleNepali"),
+        "party_id": event.get("partyId"),
+        "constituency_id": event.get("constituencyId"),
+        "event_type": event.get("type"),
+        "status": event.get("status"),
+        "description": event.get("description"),
+        "datetime": event.get("datetime"),
+        "end_time": event.get("endTime"),
+        "speakers": event.get("speakers") or [],
+        "expected_attendance": event.get("expectedAttendance"),
+        "tags": event.get("tags") or [],
+        "venue_name": venue.get("name"),
+        "venue_name_nepali": venue.get("nameNepali"),
+        "venue_address": venue.get("address"),
+        "venue_lat": coordinates[0],
+        "venue_lng": coordinates[1],
+    }
+
+def _from_csv_row(row: dict) -> dict:
+    record = {}
+    for name, value in row.items():
+        name = CSV_ALIASES.get(name, name)
+        if name in STAGING_COLUMNS:
+            record[name] = value if value != "" else None
+    for name in ("speakers", "tags"):
+        value = record.get(name)
+        record[name] = [part.strip() for part in value.split(";") if part.strip()] if value else []
+    return record
+
+def parse(data: bytes, content_type: str = "application/json") -> list:
+    """Staging records from an events.json document or a CSV file."""
+    text = data.decode("utf-8-sig")
+    if "csv" in content_type:
+        records = [_from_csv_row(row) for row in csv.DictReader(io.StringIO(text))]
+    else:
+        try:
+            document = json.loads(text)
+        except ValueError as e:
+            raise ImportRejected([f"Invalid JSON: {e}"])
+        events = document.get("events") if isinstance(document, dict) else document
+        if not isinstance(events, list):
+            raise ImportRejected(['Expected {"events": [...]} or a list of events'])
+        records = [_from_json_event(event) for event in events]
+
+    if len(records) > MAX_EVENTS:
+        raise ImportRejected([f"At most {MAX_EVENTS} events per import"])
+
+    problems = []
+    for number, record in enumerate(records, 1):
+        missing = [name for name in ("id", "title", "event_type", "datetime") if not record.get(name)]
+        if missing:
+            problems.append(f"Event #{number} ({record.get('id') or 'no id'}): missing {', '.join(missing)}")
+        long_tags = [tag for tag in record.get("tags") or [] if len(tag) > 100]
+        if long_tags:
+            problems.append(f"Event #{number} ({record.get('id')}): tags longer than 100 characters")
+    if problems:
+        raise ImportRejected(problems[:MAX_PROBLEMS])
+    return records
+
+def _copy_file(records: list) -> io.StringIO:
+    """COPY ... (FORMAT csv) input; lists travel as JSON arrays."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for record in records:
+        writer.writerow([
+            json.dumps(record.get(name) or [], ensure_ascii=False) if name in ("speakers", "tags")
+            else record.get(name)
+            for name in STAGING_COLUMNS
+        ])
+    buffer.seek(0)
+    return buffer
+
+# ============================================================================
+# IMPORT
+# ============================================================================
+
+def _validate(cur, restrict_party: Optional[str]) -> list:
+    problems = []
+
+    cur.execute("SELECT id FROM import_events GROUP BY id HAVING COUNT(*) > 1 ORDER BY id")
+    problems += [f"{row['id']}: appears more than once" for row in cur.fetchall()]
+
+    cur.execute("""
+        SELECT s.id, s.event_type, s.status, s.party_id, s.constituency_id,
+               s.event_type NOT IN (SELECT unnest(enum_range(NULL::event_type))::text) AS bad_type,
+               COALESCE(s.status NOT IN (SELECT unnest(enum_range(NULL::event_status))::text), false) AS bad_status,
+               s.party_id IS NOT NULL AND p.id IS NULL AS bad_party,
+               s.constituency_id IS NOT NULL AND c.id IS NULL AS bad_constituency,
+               (s.venue_name IS NULL) <> (s.venue_lat IS NULL OR s.venue_lng IS NULL) AS bad_venue
+        FROM import_events s
+        LEFT JOIN parties p ON p.id = s.party_id
+        LEFT JOIN constituencies c ON c.id = s.constituency_id
+        ORDER BY s.id
+    """)
+    for row in cur.fetchall():
+        if row["bad_type"]:
+            problems.append(f"{row['id']}: unknown type '{row['event_type']}'")
+        if row["bad_status"]:
+            problems.append(f"{row['id']}: unknown status '{row['status']}'")
+        if row["bad_party"]:
+            problems.append(f"{row['id']}: unknown party '{row['party_id']}'")
+        if row["bad_constituency"]:
+            problems.append(f"{row['id']}: unknown constituency '{row['constituency_id']}'")
+        if row["bad_venue"]:
+            problems.append(f"{row['id']}: venue needs both a name and coordinates")
+        if restrict_party and row["party_id"] != restrict_party:
+            problems.append(f"{row['id']}: not an event of party '{restrict_party}'")
+
+    if restrict_party:
+        # Existing events can't be taken over from another party either
+        cur.execute("""
+            SELECT e.id FROM events e JOIN import_events s ON s.id = e.id
+            WHERE e.party_id IS DISTINCT FROM %s
+        """, (restrict_party,))
+        problems += [f"{row['id']}: belongs to another party" for row in cur.fetchall()]
+
+    return problems
+
+def _upsert_venues(cur) -> tuple:
+    """Match venues by name + coordinates (as the seed does); (inserted, updated ids)."""
+    cur.execute("""
+        CREATE TEMP TABLE import_venues ON COMMIT DROP AS
+        SELECT DISTINCT ON (venue_name, venue_lat, venue_lng)
+          venue_name AS name, venue_name_nepali AS name_nepali, venue_address AS address,
+          venue_lat AS lat, venue_lng AS lng, constituency_id,
+          NULL::uuid AS venue_id, false AS is_new
+        FROM import_events
+        WHERE venue_name IS NOT NULL
+        ORDER BY venue_name, venue_lat, venue_lng, id
+    """)
+    cur.execute("""
+        UPDATE import_venues iv SET venue_id = v.id
+        FROM venues v
+        WHERE v.name = iv.name
+          AND ST_Y(v.location::geometry) = iv.lat
+          AND ST_X(v.location::geometry) = iv.lng
+    """)
+    cur.execute("""
+        UPDATE venues v
+        SET name_nepali = iv.name_nepali, address = iv.address
+        FROM import_venues iv
+        WHERE v.id = iv.venue_id
+          AND (v.name_nepali, v.address) IS DISTINCT FROM (iv.name_nepali, iv.address)
+        RETURNING v.id
+    """)
+    updated = [row["id"] for row in cur.fetchall()]
+
+    cur.execute("UPDATE import_venues SET venue_id = uuid_generate_v4(), is_new = true WHERE venue_id IS NULL")
+    cur.execute("""
+        INSERT INTO venues (id, name, name_nepali, address, location, constituency_id)
+        SELECT venue_id, name, name_nepali, address,
+               ST_SetSRID(ST_MakePoint(lng, lat), 4326)::geography, constituency_id
+        FROM import_venues
+        WHERE is_new
+    """)
+    return cur.rowcount, updated
+
+def _upsert_events(cur) -> tuple:
+    """Insert new and update changed events; (inserted ids, updated ids)."""
+    cur.execute("""
+        CREATE TEMP TABLE import_rows ON COMMIT DROP AS
+        SELECT s.id, s.title, s.title_nepali, s.party_id, s.constituency_id, iv.venue_id,
+               s.event_type::event_type AS event_type,
+               COALESCE(s.status, 'confirmed')::event_status AS status,
+               s.description, s.datetime, s.end_time,
+               ARRAY(
+                 SELECT value FROM jsonb_array_elements_text(s.speakers) WITH ORDINALITY AS x(value, n)
+                 ORDER BY n
+               )::text[] AS speakers,
+               COALESCE(s.expected_attendance, 0) AS expected_attendance,
+               ARRAY(SELECT DISTINCT jsonb_array_elements_text(s.tags))::varchar(100)[] AS tags
+        FROM import_events s
+        LEFT JOIN import_venues iv
+          ON iv.name = s.venue_name AND iv.lat = s.venue_lat AND iv.lng = s.venue_lng
+    """)
+
+    cur.execute("""
+        INSERT INTO events (
+          id, title, title_nepali, party_id, constituency_id, venue_id, event_type,
+          status, description, datetime, end_time, speakers, expected_attendance
+        )
+        SELECT id, title, title_nepali, party_id, constituency_id, venue_id, event_type,
+               status, description, datetime, end_time, speakers, expected_attendance
+        FROM import_rows r
+        WHERE NOT EXISTS (SELECT 1 FROM events e WHERE e.id = r.id)
+        RETURNING id
+    """)
+    inserted = [row["id"] for row in cur.fetchall()]
+
+    # rsvp_count is owned by RSVPs and never imported
+    cur.execute("""
+        UPDATE events e
+        SET title = r.title, title_nepali = r.title_nepali, party_id = r.party_id,
+            constituency_id = r.constituency_id, venue_id = r.venue_id,
+            event_type = r.event_type, status = r.status, description = r.description,
+            datetime = r.datetime, end_time = r.end_time, speakers = r.speakers,
+            expected_attendance = r.expected_attendance
+        FROM import_rows r
+        WHERE e.id = r.id
+          AND (e.title, e.title_nepali, e.party_id, e.constituency_id, e.venue_id,
+               e.event_type, e.status, e.description, e.datetime, e.end_time,
+               COALESCE(e.speakers, '{}'), COALESCE(e.expected_attendance, 0))
+          IS DISTINCT FROM
+              (r.title, r.title_nepali, r.party_id, r.constituency_id, r.venue_id,
+               r.event_type, r.status, r.description, r.datetime, r.end_time,
+               r.speakers, r.expected_attendance)
+        RETURNING e.id
+    """)
+    updated = [row["id"] for row in cur.fetchall()]
+    return inserted, updated
+
+def _sync_tags(cur) -> tuple:
+    """Make each imported event's tags match; (added, removed, event ids touched)."""
+    cur.execute("""
+        DELETE FROM event_tags t
+        USING import_rows r
+        WHERE t.event_id = r.id AND NOT (t.tag = ANY(r.tags))
+        RETURNING t.event_id
+    """)
+    removed = [row["event_id"] for row in cur.fetchall()]
+    cur.execute("""
+        INSERT INTO event_tags (event_id, tag)
+        SELECT r.id, unnest(r.tags) FROM import_rows r
+        ON CONFLICT DO NOTHING
+        RETURNING event_id
+    """)
+    added = [row["event_id"] for row in cur.fetchall()]
+    return len(added), len(removed), set(added) | set(removed)
+
+def run_import(cur, records: list, restrict_party: Optional[str] = None, dry_run: bool = False) -> dict:
+    """
+    Import staging records in the caller's transaction.
+
+    Rows are COPYed into a temp table, validated as a whole (ImportRejected
+    lists every problem, nothing is written), then only new or changed
+    rows are written. The read model and search index are refreshed once
+    for everything touched. With dry_run the changes are rolled back and
+    only the report is returned.
+    """
+    cur.execute("SAVEPOINT bulk_import")
+    try:
+        cur.execute("SELECT set_config('app.bulk_load', 'on', true)")
+        cur.execute("""
+            CREATE TEMP TABLE import_events (
+              id TEXT, title TEXT, title_nepali TEXT, party_id TEXT, constituency_id TEXT,
+              event_type TEXT, status TEXT, description TEXT,
+              datetime TIMESTAMPTZ, end_time TIMESTAMPTZ, speakers JSONB,
+              expected_attendance INTEGER, tags JSONB, venue_name TEXT,
+              venue_name_nepali TEXT, venue_address TEXT,
+              venue_lat DOUBLE PRECISION, venue_lng DOUBLE PRECISION
+            ) ON COMMIT DROP
+        """)
+        try:
+            cur.copy_expert(
+                f"COPY import_events ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                _copy_file(records),
+            )
+        except Exception as e:
+            # Bad timestamps / numbers surface here, with the offending line
+            raise ImportRejected([str(e).strip().splitlines()[0]]) from None
+
+        problems = _validate(cur, restrict_party)
+        if problems:
+            raise ImportRejected(problems[:MAX_PROBLEMS] + (
+                [f"... and {len(problems) - MAX_PROBLEMS} more"] if len(problems) > MAX_PROBLEMS else []
+            ))
+
+        venues_inserted, venues_updated = _upsert_venues(cur)
+        inserted, updated = _upsert_events(cur)
+        tags_added, tags_removed, retagged = _sync_tags(cur)
+
+        # Events not in the file still show a changed venue's name/address
+        cur.execute("SELECT id FROM events WHERE venue_id = ANY(%s::uuid[])", ([str(v) for v in venues_updated],))
+        touched = set(inserted) | set(updated) | retagged | {row["id"] for row in cur.fetchall()}
+        if touched:
+            cur.execute("SELECT bulk_refresh_events(%s::varchar[])", (sorted(touched),))
+
+        changed = set(inserted) | set(updated) | retagged
+        report = {
+            "dry_run": dry_run,
+            "events": {
+                "received": len(records),
+                "inserted": len(inserted),
+                "updated": len(changed) - len(inserted),
+                "unchanged": len(records) - len(changed),
+            },
+            "venues": {"inserted": venues_inserted, "updated": len(venues_updated)},
+            "tags": {"added": tags_added, "removed": tags_removed},
+            "read_model_refreshed": len(touched),
+        }
+        cur.execute("SELECT set_config('app.bulk_load', 'off', true)")
+    except Exception:
+        cur.execute("ROLLBACK TO SAVEPOINT bulk_import")
+        raise
+
+    if dry_run:
+        cur.execute("ROLLBACK TO SAVEPOINT bulk_import")
+    cur.execute("RELEASE SAVEPOINT bulk_import")
+    return report
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main(argv: Optional[list] = None) -> int:
+    import db
+
+    parser = argparse.ArgumentParser(description="Import events (events.json shape, or CSV)")
+    parser.add_argument("file", help="JSON or CSV file, or - for stdin")
+    parser.add_argument("--csv", action="store_true", help="Treat input as CSV (implied by a .csv name)")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change, write nothing")
+    args = parser.parse_args(argv)
+
+    data = sys.stdin.buffer.read() if args.file == "-" else open(args.file, "rb").read()
+    content_type = "text/csv" if args.csv or args.file.endswith(".csv") else "application/json"
+
+    try:
+        records = parse(data, content_type)
+        with db.get_db() as conn:
+            report = run_import(conn.cursor(), records, dry_run=args.dry_run)
+    except ImportRejected as e:
+        print("Import rejected:", file=sys.stderr)
+        for problem in e.problems:
+            print(f"  {problem}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""
+Nepal Elections 2026 - Map Clustering
+Quadtree (Morton-ordered) clustering of snapshot events for map tiles
+"""
+
+from typing import List, Optional
+import math
+import os
+import threading
+import cache
+import snapshot
+
+try:
+    import numpy as np
+except ImportError:  # Optional: clustering needs the event snapshot anyway
+    np = None
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Deepest zoom served; at EXPAND_ZOOM and beyond tiles list individual events
+MAX_ZOOM = 20
+EXPAND_ZOOM = int(os.environ.get("MAP_CLUSTER_EXPAND_ZOOM", "15"))
+
+# Clusters are cells of a 4x4 grid per 256px tile (64px apart on screen)
+CELL_LEVELS = 2
+
+# Leaf resolution of the Morton codes: one level per zoom plus the cell grid
+LEAF_LEVEL = MAX_ZOOM + CELL_LEVELS
+
+# bbox queries are answered tile by tile; refuse ones that span too many
+MAX_BBOX_TILES = 64
+
+# Invalidating more tiles than this at once just clears the cache
+MAX_DIRTY_POINTS = 1000
+
+TILE_CACHE = cache.TTLCache(
+    maxsize=int(os.environ.get("MAP_TILE_CACHE_SIZE", "4096")),
+    ttl=0,  # entries live until an event in the tile changes
+    name="map_tiles",
+)
+
+# ============================================================================
+# TILE MATH
+# ============================================================================
+
+def _spread(v):
+    """Interleave zeros between the low 32 bits of each value."""
+    v = v.astype(np.uint64) & np.uint64(0xFFFFFFFF)
+    for shift, mask in ((16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF),
+                        (4, 0x0F0F0F0F0F0F0F0F), (2, 0x3333333333333333),
+                        (1, 0x5555555555555555)):
+        v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+    return v
+
+def _compact(v):
+    """Inverse of _spread: keep every other bit."""
+    v = v.astype(np.uint64) & np.uint64(0x5555555555555555)
+    for shift, mask in ((1, 0x3333333333333333), (2, 0x0F0F0F0F0F0F0F0F),
+                        (4, 0x00FF00FF00FF00FF), (8, 0x0000FFFF0000FFFF),
+                        (16, 0x00000000FFFFFFFF)):
+        v = (v | (v >> np.uint64(shift))) & np.uint64(mask)
+    return v
+
+def morton(x, y):
+    """Z-order code of integer tile/cell coordinates (x in the odd bits)."""
+    return (_spread(x) << np.uint64(1)) | _spread(y)
+
+def leaf_codes(lat, lng):
+    """Morton codes at LEAF_LEVEL for arrays of WGS84 coordinates."""
+    size = 1 << LEAF_LEVEL
+    x = (np.asarray(lng, dtype=np.float64) + 180.0) / 360.0
+    sin_lat = np.sin(np.radians(np.clip(lat, -85.05112878, 85.05112878)))
+    y = 0.5 - np.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    ix = np.clip((x * size).astype(np.int64), 0, size - 1)
+    iy = np.clip((y * size).astype(np.int64), 0, size - 1)
+    return morton(ix, iy)
+
+def tile_range(z: int, x: int, y: int) -> tuple:
+    """[start, end) of leaf codes inside tile z/x/y."""
+    shift = np.uint64(2 * (LEAF_LEVEL - z))
+    code = morton(np.array([x]), np.array([y]))[0]
+    return code << shift, (code + np.uint64(1)) << shift
+
+def tiles_for_bbox(min_lng: float, min_lat: float, max_lng: float, max_lat: float, z: int) -> list:
+    """(x, y) of the tiles at zoom z covering a bbox."""
+    n = 1 << z
+
+    def tile_x(lng):
+        return min(n - 1, max(0, int((lng + 180.0) / 360.0 * n)))
+
+    def tile_y(lat):
+        lat = max(-85.05112878, min(85.05112878, lat))
+        sin_lat = math.sin(math.radians(lat))
+        y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+        return min(n - 1, max(0, int(y * n)))
+
+    return [
+        (x, y)
+        for x in range(tile_x(min_lng), tile_x(max_lng) + 1)
+        for y in range(tile_y(max_lat), tile_y(min_lat) + 1)
+    ]
+
+def expansion_zoom(first: int, last: int) -> Optional[int]:
+    """Zoom at which the sorted leaf codes first..last stop sharing a cell."""
+    if first == last:
+        return None  # Same spot: never splits, listed as events at EXPAND_ZOOM
+    # With p the highest differing bit, the codes share every level below
+    # LEAF_LEVEL - p // 2 and are in different cells from that level on
+    split_level = LEAF_LEVEL - ((int(first) ^ int(last)).bit_length() - 1) // 2
+    return max(0, min(EXPAND_ZOOM, split_level - CELL_LEVELS))
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+class ClusterIndex:
+    """
+    Events from the upcoming-events snapshot sorted by leaf Morton code.
+
+    Every tile, and every cluster cell inside it, is a contiguous run of
+    that order, so a tile is two binary searches plus a group-by over at
+    most 16 cells. When the snapshot publishes, only events whose cell or
+    map attributes changed invalidate cached tiles (at every zoom).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = -1
+        self._codes = None      # sorted leaf codes
+        self._order = None      # snapshot row index for each sorted code
+        self._cols = None
+        self._points = {}       # id -> (leaf code, map attributes)
+        self.rebuilds_total = 0
+        self.tiles_invalidated_total = 0
+
+    @property
+    def available(self) -> bool:
+        return np is not None and snapshot.snapshot.available
+
+    def sync(self):
+        """Re-sort against the latest snapshot and invalidate changed tiles."""
+        version, cols = snapshot.snapshot.columns()
+        if version == self._version or cols is None:
+            return
+        with self._lock:
+            if version == self._version:
+                return
+
+            codes = leaf_codes(cols.lat, cols.lng)
+            located = ~np.isnan(cols.lat) & ~np.isnan(cols.lng)
+            points = {}
+            for i in np.nonzero(located)[0]:
+                row = cols.rows[i]
+                points[row["id"]] = (int(codes[i]), (
+                    row.get("party_id"), row.get("party_color"), row.get("event_type"), row.get("title"),
+                ))
+
+            dirty = self._dirty_codes(points)
+
+            idx = np.nonzero(located)[0]
+            order = idx[np.argsort(codes[idx], kind="stable")]
+            self._codes, self._order, self._cols = codes[order], order, cols
+            self._points = points
+            self._version = version
+            self.rebuilds_total += 1
+
+        self._invalidate(dirty)
+
+    def _dirty_codes(self, points: dict) -> list:
+        """Leaf codes (old and new) of events added, moved, changed or removed."""
+        dirty = []
+        for event_id in self._points.keys() | points.keys():
+            old, new = self._points.get(event_id), points.get(event_id)
+            if old != new:
+                dirty.extend(point[0] for point in (old, new) if point is not None)
+        return dirty
+
+    def _invalidate(self, dirty: list):
+        if not dirty:
+            return
+        if len(dirty) > MAX_DIRTY_POINTS:
+            self.tiles_invalidated_total += len(TILE_CACHE)
+            TILE_CACHE.clear()
+            return
+
+        codes = np.unique(np.array(dirty, dtype=np.uint64))
+        for z in range(MAX_ZOOM + 1):
+            tile_codes = np.unique(codes >> np.uint64(2 * (LEAF_LEVEL - z)))
+            xs, ys = _compact(tile_codes >> np.uint64(1)), _compact(tile_codes)
+            for x, y in zip(xs.tolist(), ys.tolist()):
+                if TILE_CACHE.pop((z, x, y)) is not None:
+                    self.tiles_invalidated_total += 1
+
+    def _event_point(self, i: int) -> dict:
+        row = self._cols.rows[i]
+        return {
+            "kind": "event",
+            "id": row["id"],
+            "lat": row.get("venue_lat"),
+            "lng": row.get("venue_lng"),
+            "type": row["event_type"],
+            "party_id": row.get("party_id"),
+            "party_color": row.get("party_color"),
+            "title": row["title"],
+        }
+
+    def _build_tile(self, z: int, x: int, y: int, party_id: Optional[str], event_type: Optional[str]) -> list:
+        start, end = tile_range(z, x, y)
+        lo = int(np.searchsorted(self._codes, start, side="left"))
+        hi = int(np.searchsorted(self._codes, end, side="left"))
+        codes, rows = self._codes[lo:hi], self._order[lo:hi]
+
+        cols = self._cols
+        if party_id:
+            keep = cols.party[rows] == cols.code("party", party_id)
+            codes, rows = codes[keep], rows[keep]
+        if event_type:
+            keep = cols.type[rows] == cols.code("type", event_type)
+            codes, rows = codes[keep], rows[keep]
+
+        if z >= EXPAND_ZOOM:
+            return [self._event_point(i) for i in rows]
+
+        cell_level = z + CELL_LEVELS
+        cells = codes >> np.uint64(2 * (LEAF_LEVEL - cell_level))
+        bounds = np.flatnonzero(np.diff(cells)) + 1
+        items = []
+        for group_codes, group_rows in zip(np.split(codes, bounds), np.split(rows, bounds)):
+            if len(group_rows) == 0:
+                continue
+            if len(group_rows) == 1:
+                items.append(self._event_point(group_rows[0]))
+                continue
+
+            parties = {}
+            for i in group_rows:
+                key = cols.rows[i].get("party_id") or "independent"
+                parties[key] = parties.get(key, 0) + 1
+            items.append({
+                "kind": "cluster",
+                "id": f"{cell_level}/{int(group_codes[0]) >> (2 * (LEAF_LEVEL - cell_level))}",
+                "lat": round(float(cols.lat[group_rows].mean()), 6),
+                "lng": round(float(cols.lng[group_rows].mean()), 6),
+                "count": len(group_rows),
+                "parties": parties,
+                "expansion_zoom": expansion_zoom(group_codes[0], group_codes[-1]),
+            })
+        return items
+
+    def tile(self, z: int, x: int, y: int, party_id: Optional[str] = None, event_type: Optional[str] = None) -> list:
+        """Clusters and events for tile z/x/y (cached per filter combination)."""
+        self.sync()
+        variants = TILE_CACHE.get((z, x, y))
+        if variants is None:
+            variants = {}
+            TILE_CACHE.set((z, x, y), variants)
+
+        key = (party_id, event_type)
+        items = variants.get(key)
+        if items is None:
+            with self._lock:
+                items = self._build_tile(z, x, y, party_id, event_type)
+            variants[key] = items
+        return items
+
+    def bbox(self, min_lng: float, min_lat: float, max_lng: float, max_lat: float, z: int,
+             party_id: Optional[str] = None, event_type: Optional[str] = None) -> Optional[List[dict]]:
+        """Items of every tile covering the bbox, or None if it spans too many."""
+        tiles = tiles_for_bbox(min_lng, min_lat, max_lng, max_lat, z)
+        if len(tiles) > MAX_BBOX_TILES:
+            return None
+        items = []
+        for x, y in tiles:
+            items.extend(self.tile(z, x, y, party_id, event_type))
+        return items
+
+    def stats(self) -> dict:
+        return {
+            "available": self.available,
+            "points": len(self._points),
+            "snapshot_version": self._version,
+            "rebuilds_total": self.rebuilds_total,
+            "tiles_invalidated_total": self.tiles_invalidated_total,
+            "tile_cache": TILE_CACHE.stats(),
+        }
+
+index = ClusterIndex()
@@ -0,0 +1,206 @@
+"""
+Nepal Elections 2026 - Response Compression
+Negotiated brotli/gzip with a cache of already-compressed bodies
+"""
+
+from typing import Optional
+import gzip
+import hashlib
+import os
+import threading
+import time
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+import cache
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip only
+    brotli = None
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Bodies smaller than this go out as-is; below ~1 KB headers dominate anyway
+MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", "1024"))
+
+# Bodies at least this large are compressed on a worker thread, so one big
+# (e.g. private, never cached) page does not stall the event loop
+THREADPOOL_MIN_SIZE = int(os.environ.get("COMPRESS_THREADPOOL_MIN_SIZE", "65536"))
+
+GZIP_LEVEL = int(os.environ.get("COMPRESS_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("COMPRESS_BROTLI_QUALITY", "5"))
+
+# Compressed variants of shareable (non-private) bodies, keyed by content
+VARIANT_CACHE = cache.TTLCache(
+    maxsize=int(os.environ.get("COMPRESS_CACHE_SIZE", "512")),
+    ttl=float(os.environ.get("COMPRESS_CACHE_TTL", "600")),
+    name="compressed_variants",
+)
+
+COMPRESSIBLE_TYPES = ("application/json", "application/geo+json", "text/", "application/javascript")
+
+# ============================================================================
+# NEGOTIATION
+# ============================================================================
+
+def _encodings() -> tuple:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Best supported coding from an Accept-Encoding header (q=0 excluded)."""
+    offered = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            offered[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in _encodings():  # server preference breaks ties
+        q = offered.get(encoding, offered.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+# ============================================================================
+# STATS
+# ============================================================================
+
+_stats_lock = threading.Lock()
+_route_stats = {}  # route -> counters
+
+def _record(route: str, raw: int, sent: int, seconds: float, cached: bool):
+    with _stats_lock:
+        counters = _route_stats.setdefault(route, {
+            "compressed": 0, "cache_hits": 0, "bytes_in": 0, "bytes_out": 0, "seconds": 0.0,
+        })
+        counters["compressed"] += 1
+        counters["cache_hits"] += cached
+        counters["bytes_in"] += raw
+        counters["bytes_out"] += sent
+        counters["seconds"] += seconds
+
+def stats() -> dict:
+    """Per-route compression ratio and time, plus the variant cache."""
+    with _stats_lock:
+        routes = {
+            route: {
+                "compressed": c["compressed"],
+                "cache_hits": c["cache_hits"],
+                "ratio": round(c["bytes_out"] / c["bytes_in"], 3) if c["bytes_in"] else None,
+                "avg_ms": round(c["seconds"] * 1000 / c["compressed"], 3),
+                "bytes_saved": c["bytes_in"] - c["bytes_out"],
+            }
+            for route, c in _route_stats.items()
+        }
+    return {
+        "encodings": list(_encodings()),
+        "min_size": MIN_SIZE,
+        "routes": routes,
+        "variant_cache": VARIANT_CACHE.stats(),
+    }
+
+# ============================================================================
+# MIDDLEWARE
+# ============================================================================
+
+class CompressionMiddleware:
+    """
+    Pure ASGI compression for complete (non-streaming) responses.
+
+    Shareable responses (anything not Cache-Control: private) have their
+    compressed variant cached by route, encoding and a hash of the body,
+    so a hot payload is compressed once per version rather than per
+    request. Streaming responses (SSE, exports) and bodies that already
+    carry a Content-Encoding pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start_message = None
+        body_parts = []
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+
+            if passthrough:
+                return await send(message)
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                    or message["status"] < 200 or message["status"] in (204, 304)
+                ):
+                    passthrough = True
+                    return await send(message)
+                start_message = message
+                return
+
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                if start_message is not None:
+                    # Streaming: flush what we held and stop interfering
+                    passthrough = True
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": b"".join(body_parts), "more_body": True})
+                return
+
+            await self._finish(scope, send, start_message, b"".join(body_parts), encoding)
+
+        await self.app(scope, receive, send_compressed)
+
+    async def _finish(self, scope, send, start_message: dict, body: bytes, encoding: str):
+        headers = MutableHeaders(scope=start_message)
+        headers.add_vary_header("Accept-Encoding")
+
+        if len(body) < MIN_SIZE:
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        endpoint = scope.get("endpoint")
+        route = getattr(endpoint, "__name__", None) or scope["path"]
+        shareable = "private" not in headers.get("cache-control", "")
+
+        started = time.perf_counter()
+        key = (route, encoding, hashlib.sha1(body).digest()) if shareable else None
+        compressed = VARIANT_CACHE.get(key) if key else None
+        cached = compressed is not None
+        if compressed is None:
+            if len(body) >= THREADPOOL_MIN_SIZE:
+                compressed = await run_in_threadpool(compress, body, encoding)
+            else:
+                compressed = compress(body, encoding)
+            if key:
+                VARIANT_CACHE.set(key, compressed)
+        _record(route, len(body), len(compressed), time.perf_counter() - started, cached)
+
+        headers["Content-Encoding"] = encoding
+        headers["Content-Length"] = str(len(compressed))
+        await send(start_message)
+        await send({"type": "http.response.body", "body": compressed})
@@ -0,0 +1,92 @@
+"""
+Nepal Elections 2026 - RSVP Counters
+Periodic folding of the rsvp_count_deltas log (sql/008_rsvp_counters.sql)
+"""
+
+from typing import Optional
+import asyncio
+import os
+import time
+import db
+
+# Upper bound on how stale rsvp_count can be in list responses
+FOLD_INTERVAL = float(os.environ.get("RSVP_FOLD_INTERVAL", "1.0"))
+
+class RsvpCounterFolder:
+    """
+    Background task that calls fold_rsvp_count_deltas() on an interval.
+
+    Every worker runs one; the function takes an advisory lock, so only one
+    fold happens at a time and the others return immediately.
+    """
+
+    def __init__(self, interval: float = FOLD_INTERVAL):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self.folds_total = 0
+        self.events_folded_total = 0
+        self.errors_total = 0
+        self.last_fold_at: Optional[float] = None
+
+    async def fold(self) -> int:
+        row = await db.fetch_one("SELECT fold_rsvp_count_deltas() AS events")
+        events = row["events"]
+        if events >= 0:
+            self.folds_total += 1
+            self.events_folded_total += events
+            self.last_fold_at = time.time()
+        return events
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.fold()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors_total += 1
+                print(f"RSVP counter fold failed: {e}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "interval_seconds": self.interval,
+            "folds_total": self.folds_total,
+            "events_folded_total": self.events_folded_total,
+            "errors_total": self.errors_total,
+            "last_fold_at": self.last_fold_at,
+        }
+
+# Pending deltas are summed in the statement that reads the row. Read
+# separately, a fold committing in between would be missing from both
+# (count taken before it, deltas gone after it) and undercount.
+EXACT_RSVP_COUNT = """
+    events_read.rsvp_count + COALESCE(
+        (SELECT SUM(d.delta) FROM rsvp_count_deltas d WHERE d.event_id = events_read.id), 0
+    )::integer AS exact_rsvp_count
+"""
+
+def with_exact_rsvp_count(columns: str) -> str:
+    """An events_read SELECT list plus the exact count (see use_exact_rsvp_count)."""
+    return f"{columns}, {EXACT_RSVP_COUNT}"
+
+def use_exact_rsvp_count(rows: list) -> list:
+    """Replace rows' folded rsvp_count with the exact one selected alongside it."""
+    for row in rows:
+        row["rsvp_count"] = row.pop("exact_rsvp_count")
+    return rows
+
+folder = RsvpCounterFolder()
@@ -0,0 +1,198 @@
+"""
+Nepal Elections 2026 - Event Export
+Streams filtered events as NDJSON or CSV through a server-side cursor
+"""
+
+from contextlib import ExitStack
+from typing import Optional
+import csv
+import io
+import itertools
+import os
+import anyio
+from starlette.concurrency import run_in_threadpool
+import db
+import fulltext
+import render
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+EXPORT_FORMATS = "^(ndjson|csv)$"
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Rows per FETCH from the named cursor; memory is bounded by one batch
+BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", "1000"))
+
+# Each running export holds a pooled connection for its whole duration
+MAX_CONCURRENT = int(os.environ.get("EXPORT_MAX_CONCURRENT", "2"))
+
+# Flat columns for CSV; nested objects and arrays are spread or joined
+CSV_COLUMNS = {
+    "id": "id",
+    "title": "title",
+    "title_nepali": "title_nepali",
+    "party_id": "party_id",
+    "constituency_id": "constituency_id",
+    "type": "event_type",
+    "status": "status",
+    "datetime": render.EVENT_FIELD_SQL["datetime"],
+    "end_time": render.EVENT_FIELD_SQL["end_time"],
+    "expected_attendance": "expected_attendance",
+    "rsvp_count": "rsvp_count",
+    "venue_name": "NULLIF(venue_name, '')",
+    "venue_address": "venue_address",
+    "lat": "venue_lat",
+    "lng": "venue_lng",
+    "speakers": "array_to_string(speakers, '; ')",
+    "tags": "array_to_string(tags, '; ')",
+}
+
+class ExportBusy(Exception):
+    """Raised when MAX_CONCURRENT exports are already running."""
+
+class ExportSlot:
+    """One reserved export slot; release() may be called more than once."""
+
+    def __init__(self, exporter: "EventExporter"):
+        self._exporter = exporter
+        self.released = False
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self._exporter.running -= 1
+
+# ============================================================================
+# CURSOR
+# ============================================================================
+
+_cursor_names = itertools.count(1)
+
+class _CursorReader:
+    """
+    A named (server-side) cursor on a pooled connection, a replica's when
+    the request allows it.
+
+    Each method is blocking and is called through the threadpool; the
+    connection stays checked out, inside one read transaction, until
+    close().
+    """
+
+    def __init__(self, query: str, params: list, settings: dict):
+        self.query = query
+        self.params = params
+        self.settings = settings  # transaction-local settings the query relies on
+        self._stack = ExitStack()
+        self._cur = None
+
+    def open(self):
+        conn = self._stack.enter_context(db.get_db(replica=True))
+        fulltext.apply_settings(conn.cursor(), self.settings)  # same transaction as the DECLARE
+        self._cur = conn.cursor(name=f"event_export_{next(_cursor_names)}")
+        self._cur.itersize = BATCH_SIZE
+        self._cur.execute(self.query, self.params)
+
+    def fetch(self) -> list:
+        return self._cur.fetchmany(BATCH_SIZE)
+
+    def close(self):
+        try:
+            self._stack.close()
+        except Exception as e:
+            print(f"Event export cleanup failed: {e}")
+
+# ============================================================================
+# EXPORTER
+# ============================================================================
+
+class EventExporter:
+    """
+    Event dumps in id order.
+
+    Rows are read BATCH_SIZE at a time and encoded per batch, so memory
+    use does not grow with the export. Ordering by id makes every export
+    resumable: pass the last id received as after_id.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT):
+        self.max_concurrent = max_concurrent
+        self.running = 0
+        self.exports_total = 0
+        self.rows_total = 0
+        self.aborted_total = 0
+        self.rejected_total = 0
+
+    def query(self, fmt: str, where: str, params: list, after_id: Optional[str], fields: Optional[tuple]) -> tuple:
+        if fmt == "csv":
+            select = ", ".join(f'{sql} AS "{name}"' for name, sql in CSV_COLUMNS.items())
+        else:
+            names = tuple(name for name in (fields or render.EVENT_FIELD_SQL) if name != "user_rsvp")
+            select = render.event_json_column(None, names, "full", None)
+        if after_id:
+            where += " AND id > %s"
+            params = params + [after_id]
+        return f"SELECT {select} FROM events_read WHERE 1=1{where} ORDER BY id", params
+
+    def _encode(self, fmt: str, rows: list) -> bytes:
+        if fmt == "ndjson":
+            return "".join(row["event_json"] + "\n" for row in rows).encode("utf-8")
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(row.values() for row in rows)
+        return buffer.getvalue().encode("utf-8")
+
+    def admit(self) -> ExportSlot:
+        """
+        Reserve an export slot before responding, or raise ExportBusy.
+
+        Checked and taken in one step, so concurrent requests can't all
+        pass the check. stream() releases the slot when it ends; callers
+        release it themselves if the body never runs.
+        """
+        if self.running >= self.max_concurrent:
+            self.rejected_total += 1
+            raise ExportBusy(f"{self.max_concurrent} exports already running")
+        self.running += 1
+        return ExportSlot(self)
+
+    async def stream(self, slot: ExportSlot, fmt: str, query: str, params: list, settings: Optional[dict] = None):
+        """Response body for one export; `settings` as from fulltext.search_settings()."""
+        reader = _CursorReader(query, params, settings or {})
+        completed = False
+        self.exports_total += 1
+        try:
+            await run_in_threadpool(reader.open)
+            if fmt == "csv":
+                yield (",".join(CSV_COLUMNS) + "\r\n").encode("utf-8")
+            while True:
+                rows = await run_in_threadpool(reader.fetch)
+                if not rows:
+                    break
+                self.rows_total += len(rows)
+                yield self._encode(fmt, rows)
+            completed = True
+        finally:
+            slot.release()
+            if not completed:
+                self.aborted_total += 1
+            # Runs on client disconnect too, so shield it from the cancellation
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(reader.close)
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "max_concurrent": self.max_concurrent,
+            "batch_size": BATCH_SIZE,
+            "exports_total": self.exports_total,
+            "rows_total": self.rows_total,
+            "aborted_total": self.aborted_total,
+            "rejected_total": self.rejected_total,
+        }
+
+exporter = EventExporter()
@@ -0,0 +1,93 @@
+"""
+Nepal Elections 2026 - Event Search
+Full-text and fuzzy matching against the event_search index (sql/005)
+"""
+
+from typing import Optional
+import os
+import re
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# search_mode= values: "full" for submitted searches, "prefix" for
+# search-as-you-type where the last word is still being typed
+SEARCH_MODES = "^(full|prefix)$"
+
+# word_similarity threshold for typo-tolerant matching of transliterated
+# names ("Kathmandu" vs "Kathamandu"); lower is more forgiving
+FUZZY_THRESHOLD = float(os.environ.get("SEARCH_FUZZY_THRESHOLD", "0.45"))
+
+# Terms shorter than this only use the tsvector index; trigrams of very
+# short strings match almost everything
+FUZZY_MIN_LENGTH = 3
+
+# Characters with meaning in tsquery syntax
+_TSQUERY_SPECIAL = re.compile(r"[&|!():*<>'\\\"]+")
+
+# ============================================================================
+# QUERY BUILDING
+# ============================================================================
+
+def _prefix_tsquery(term: str) -> Optional[str]:
+    """Turn "gagan tha" into "gagan:* & tha:*" for to_tsquery('simple', ...)."""
+    words = _TSQUERY_SPECIAL.sub(" ", term).split()
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+def _match_sql(term: str, mode: str) -> tuple:
+    """SQL expressions (tsquery, params, fuzzy) for a search term."""
+    if mode == "prefix":
+        prefix = _prefix_tsquery(term)
+        tsquery = "to_tsquery('simple', %s)" if prefix else "NULL::tsquery"
+        tsquery_params = [prefix] if prefix else []
+    else:
+        tsquery = "(websearch_to_tsquery('english', %s) || websearch_to_tsquery('simple', %s))"
+        tsquery_params = [term, term]
+    return tsquery, tsquery_params, len(term) >= FUZZY_MIN_LENGTH
+
+def search_settings(term: str) -> dict:
+    """
+    Transaction-local settings a search's SQL relies on. A query run in
+    another transaction (e.g. an export's cursor) must apply them there.
+    """
+    if len(term.strip()) < FUZZY_MIN_LENGTH:
+        return {}
+    return {"pg_trgm.word_similarity_threshold": str(FUZZY_THRESHOLD)}
+
+def apply_settings(cur, settings: dict):
+    """Set `settings` for the current transaction only."""
+    for name, value in settings.items():
+        cur.execute("SELECT set_config(%s, %s, true)", (name, value))
+
+def apply_search(cur, term: str, mode: str = "full") -> tuple:
+    """
+    Build the filter and rank for an events_read query.
+
+    Returns (where, params, rank) where `where` is an " AND ..." clause
+    restricting rows to matches and `rank` is an (sql, params) expression
+    scoring a row of events_read by relevance.
+    """
+    term = term.strip().lower()
+    tsquery, tsquery_params, fuzzy = _match_sql(term, mode)
+
+    if fuzzy:
+        apply_settings(cur, search_settings(term))
+        match = f"(s.document @@ {tsquery} OR %s <%% s.search_text)"
+        match_params = tsquery_params + [term]
+        score = f"ts_rank_cd(s.document, {tsquery}) + word_similarity(%s, s.search_text)"
+        score_params = tsquery_params + [term]
+    else:
+        match = f"s.document @@ {tsquery}"
+        match_params = list(tsquery_params)
+        score = f"ts_rank_cd(s.document, {tsquery})"
+        score_params = list(tsquery_params)
+
+    where = f" AND id IN (SELECT s.event_id FROM event_search s WHERE {match})"
+    rank = (
+        f"(SELECT {score} FROM event_search s WHERE s.event_id = events_read.id)",
+        score_params,
+    )
+    return where, match_params, rank
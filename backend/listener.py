@@ -0,0 +1,105 @@
+"""
+Nepal Elections 2026 - Change Listener
+One LISTEN connection per worker, fanning NOTIFY payloads out to callbacks
+"""
+
+from typing import Callable, Optional
+import select
+import threading
+import traceback
+import psycopg2
+import psycopg2.extensions
+import db
+
+# Seconds between reconnect attempts after the listen connection drops
+RECONNECT_DELAY = 2.0
+
+# Upper bound on how long stop() waits for the listener thread
+POLL_INTERVAL = 1.0
+
+class ChangeListener:
+    """
+    Background thread that LISTENs on a set of channels.
+
+    Callbacks run on the listener thread and must be quick and thread-safe.
+    After a (re)connect every callback is invoked with payload None, since
+    notifications sent while disconnected are lost and caches must resync.
+    """
+
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self._callbacks = {}  # channel -> [callback]
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.connected = False
+        self.notifications_total = 0
+        self.reconnects_total = 0
+
+    def subscribe(self, channel: str, callback: Callable[[Optional[str]], None]):
+        self._callbacks.setdefault(channel, []).append(callback)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pg-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=POLL_INTERVAL * 2)
+            self._thread = None
+
+    def _dispatch(self, channel: str, payload: Optional[str]):
+        for callback in self._callbacks.get(channel, []):
+            try:
+                callback(payload)
+            except Exception:
+                traceback.print_exc()
+
+    def _run(self):
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(self.dsn)
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                cur = conn.cursor()
+                for channel in self._callbacks:
+                    cur.execute(f'LISTEN "{channel}"')
+                self.connected = True
+
+                # Anything could have changed while we were not listening
+                for channel in self._callbacks:
+                    self._dispatch(channel, None)
+
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], POLL_INTERVAL) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        self.notifications_total += 1
+                        self._dispatch(notify.channel, notify.payload)
+            except Exception as e:
+                if not self._stop.is_set():
+                    print(f"Change listener disconnected: {e}")
+                    self.reconnects_total += 1
+                    self._stop.wait(RECONNECT_DELAY)
+            finally:
+                self.connected = False
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    def stats(self) -> dict:
+        return {
+            "connected": self.connected,
+            "channels": sorted(self._callbacks),
+            "notifications_total": self.notifications_total,
+            "reconnects_total": self.reconnects_total,
+        }
+
+listener = ChangeListener(db.DATABASE_URL)
@@ -0,0 +1,405 @@
+"""
+Nepal Elections 2026 - Load Test
+Replays a weighted endpoint mix against a running API and reports latency percentiles
+
+CLI:
+    python loadtest.py --scenario mixed --duration 60 --concurrency 50
+    python loadtest.py --scenario rsvp-storm --rate 400       # open loop, 400 req/s
+    python loadtest.py --save-baseline benchmarks/mixed.json
+    python loadtest.py --baseline benchmarks/mixed.json       # exit 1 on a regression
+
+Load the synthetic data set first (synthetic.py) so there is something to
+browse; virtual users sign in with synthetic phones and the test OTP.
+"""
+
+from typing import Optional
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from synthetic import NEPAL_BBOX, TAGS, phone
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+BASE_URL = os.environ.get("LOADTEST_BASE_URL", "http://localhost:5012")
+API = "/election/v1"
+TEST_OTP = "123456"
+
+# Operation weights per scenario
+SCENARIOS = {
+    # Anonymous visitors: lists, details, the map
+    "browse": {
+        "list_events": 30, "list_events_filtered": 15, "list_events_cursor": 5, "search": 5,
+        "event_detail": 20, "nearby": 10, "detect": 6, "clusters": 6, "reference": 3,
+    },
+    # Signed-in visitors as well
+    "mixed": {
+        "list_events": 25, "list_events_filtered": 12, "list_events_cursor": 5, "search": 5,
+        "event_detail": 18, "nearby": 8, "detect": 5, "clusters": 5, "reference": 2,
+        "rsvp": 10, "my_rsvps": 5,
+    },
+    # Everyone RSVPs to the same few events while others keep reading them
+    "rsvp-storm": {"rsvp_hot": 75, "event_detail_hot": 15, "list_events_popular": 10},
+}
+
+HOT_EVENTS = 3
+
+# A p95/p99 this much above the baseline (or throughput this much below) is a regression
+TOLERANCE = 0.20
+
+# ============================================================================
+# OPERATIONS
+# ============================================================================
+
+class Workload:
+    """
+    What the operations draw from: constituencies, event ids and signed-in
+    users, discovered from the API before the clock starts.
+    """
+
+    def __init__(self):
+        self.constituencies = []  # (id, lat, lng)
+        self.parties = []
+        self.event_ids = []
+        self.hot_event_ids = []
+        self.tokens = []
+
+    async def discover(self, client, users: int, user_pool: int, sample_pages: int, rng: random.Random):
+        response = await client.get(f"{API}/constituencies")
+        response.raise_for_status()
+        self.constituencies = [
+            (c["id"], c["center"][0], c["center"][1])
+            for c in response.json()["data"] if c.get("center")
+        ]
+        response = await client.get(f"{API}/parties")
+        response.raise_for_status()
+        self.parties = [p["id"] for p in response.json()["data"]]
+
+        response = await client.get(f"{API}/events", params={"sort": "-rsvp_count", "per_page": HOT_EVENTS, "count": "none"})
+        response.raise_for_status()
+        self.hot_event_ids = [event["id"] for event in response.json()["data"]]
+
+        cursor = None
+        for _ in range(sample_pages):
+            params = {"per_page": 100, "count": "none", "view": "card"}
+            if cursor:
+                params["cursor"] = cursor
+            body = (await client.get(f"{API}/events", params=params)).json()
+            self.event_ids += [event["id"] for event in body["data"]]
+            cursor = body["pagination"]["next_cursor"]
+            if not cursor:
+                break
+
+        for index in rng.sample(range(user_pool), min(users, user_pool)):
+            response = await client.post(f"{API}/auth/verify-otp", json={"phone": phone(index), "otp": TEST_OTP})
+            response.raise_for_status()
+            self.tokens.append(response.json()["access_token"])
+
+        if not self.event_ids or not self.constituencies:
+            raise RuntimeError("No events or constituencies to test against; load synthetic data first")
+
+    def point(self, rng: random.Random, spread: float = 0.05) -> tuple:
+        """Somewhere near a constituency centre (where people are)."""
+        _, lat, lng = rng.choice(self.constituencies)
+        return lat + rng.uniform(-spread, spread), lng + rng.uniform(-spread, spread)
+
+    def auth(self, rng: random.Random) -> dict:
+        return {"Authorization": f"Bearer {rng.choice(self.tokens)}"}
+
+async def list_events(client, w: Workload, rng):
+    return await client.get(f"{API}/events", params={"page": rng.randint(1, 5), "view": rng.choice(("card", "full"))})
+
+async def list_events_filtered(client, w: Workload, rng):
+    params = rng.choice((
+        {"constituency_id": rng.choice(w.constituencies)[0]},
+        {"party_id": rng.choice(w.parties)},
+        {"event_type": rng.choice(("rally", "meeting", "canvassing", "townhall"))},
+    ))
+    params["sort"] = rng.choice(("datetime", "-rsvp_count"))
+    return await client.get(f"{API}/events", params=params)
+
+async def list_events_cursor(client, w: Workload, rng):
+    first = await client.get(f"{API}/events", params={"count": "none", "per_page": 20})
+    cursor = first.json()["pagination"]["next_cursor"] if first.status_code == 200 else None
+    if not cursor:
+        return first
+    return await client.get(f"{API}/events", params={"count": "none", "per_page": 20, "cursor": cursor})
+
+async def list_events_popular(client, w: Workload, rng):
+    return await client.get(f"{API}/events", params={"sort": "-rsvp_count", "per_page": 20})
+
+async def search(client, w: Workload, rng):
+    return await client.get(f"{API}/events", params={"search": rng.choice(TAGS + ("rally", "kathmandu"))})
+
+async def event_detail(client, w: Workload, rng):
+    return await client.get(f"{API}/events/{rng.choice(w.event_ids)}")
+
+async def event_detail_hot(client, w: Workload, rng):
+    return await client.get(f"{API}/events/{rng.choice(w.hot_event_ids)}")
+
+async def nearby(client, w: Workload, rng):
+    lat, lng = w.point(rng)
+    return await client.get(
+        f"{API}/events/nearby", params={"lat": lat, "lng": lng, "radius": rng.choice((2000, 5000, 20000))}
+    )
+
+async def detect(client, w: Workload, rng):
+    min_lng, min_lat, max_lng, max_lat = NEPAL_BBOX
+    lat, lng = w.point(rng, 0.2) if rng.random() < 0.8 else (rng.uniform(min_lat, max_lat), rng.uniform(min_lng, max_lng))
+    return await client.get(f"{API}/constituencies/detect", params={"lat": lat, "lng": lng})
+
+async def clusters(client, w: Workload, rng):
+    z = rng.randint(7, 12)
+    lat, lng = w.point(rng)
+    half = 180 / (1 << z)
+    bbox = f"{lng - half:.5f},{lat - half / 2:.5f},{lng + half:.5f},{lat + half / 2:.5f}"
+    return await client.get(f"{API}/map/clusters", params={"z": z, "bbox": bbox})
+
+async def reference(client, w: Workload, rng):
+    return await client.get(f"{API}/{rng.choice(('parties', 'constituencies'))}")
+
+async def rsvp(client, w: Workload, rng):
+    return await client.post(
+        f"{API}/events/{rng.choice(w.event_ids)}/rsvp",
+        json={"status": rng.choice(("going", "going", "interested"))}, headers=w.auth(rng),
+    )
+
+async def rsvp_hot(client, w: Workload, rng):
+    # Flipping between going and interested moves the counter both ways
+    return await client.post(
+        f"{API}/events/{rng.choice(w.hot_event_ids)}/rsvp",
+        json={"status": rng.choice(("going", "interested"))}, headers=w.auth(rng),
+    )
+
+async def my_rsvps(client, w: Workload, rng):
+    return await client.get(f"{API}/users/me/rsvps", headers=w.auth(rng))
+
+OPERATIONS = {fn.__name__: fn for fn in (
+    list_events, list_events_filtered, list_events_cursor, list_events_popular, search,
+    event_detail, event_detail_hot, nearby, detect, clusters, reference, rsvp, rsvp_hot, my_rsvps,
+)}
+
+# ============================================================================
+# RESULTS
+# ============================================================================
+
+def percentile(ordered: list, p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+
+class Results:
+    def __init__(self):
+        self.latencies = {}  # operation -> [seconds]
+        self.statuses = {}   # operation -> {status: count}
+
+    def record(self, operation: str, seconds: float, status: str):
+        self.latencies.setdefault(operation, []).append(seconds)
+        counts = self.statuses.setdefault(operation, {})
+        counts[status] = counts.get(status, 0) + 1
+
+    def summary(self, elapsed: float) -> dict:
+        endpoints = {}
+        for operation, values in sorted(self.latencies.items()):
+            ordered = sorted(values)
+            statuses = self.statuses[operation]
+            errors = sum(n for status, n in statuses.items() if not status.startswith(("2", "3")))
+            endpoints[operation] = {
+                "requests": len(ordered),
+                "errors": errors,
+                "rps": round(len(ordered) / elapsed, 2),
+                "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+                "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+                "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+                "max_ms": round(ordered[-1] * 1000, 2),
+                "statuses": statuses,
+            }
+        everything = sorted(v for values in self.latencies.values() for v in values)
+        return {
+            "requests": len(everything),
+            "rps": round(len(everything) / elapsed, 2),
+            "p50_ms": round(percentile(everything, 50) * 1000, 2),
+            "p95_ms": round(percentile(everything, 95) * 1000, 2),
+            "p99_ms": round(percentile(everything, 99) * 1000, 2),
+            "endpoints": endpoints,
+        }
+
+# ============================================================================
+# DRIVER
+# ============================================================================
+
+async def _call(client, workload: Workload, operation: str, rng, results: Optional[Results], started: float):
+    """Run one operation; latency counts from `started` (its scheduled time in open loop)."""
+    try:
+        response = await OPERATIONS[operation](client, workload, rng)
+        status = str(response.status_code)
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    if results is not None:
+        results.record(operation, time.perf_counter() - started, status)
+
+async def _closed_loop(client, workload, mix, seed, concurrency, warmup_until, deadline, results):
+    """Each worker sends its next request when the previous one returns."""
+    names, weights = list(mix), list(mix.values())
+
+    async def worker(number: int):
+        rng = random.Random(f"{seed}:{number}")
+        while (now := time.perf_counter()) < deadline:
+            await _call(client, workload, rng.choices(names, weights)[0], rng,
+                        results if now >= warmup_until else None, now)
+
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+
+async def _open_loop(client, workload, mix, seed, concurrency, rate, warmup_until, deadline, results):
+    """
+    Poisson arrivals at `rate` per second, whatever the response times.
+    Latency includes time spent queued behind the concurrency limit, so a
+    slow server is not hidden by fewer requests being sent (coordinated
+    omission).
+    """
+    names, weights = list(mix), list(mix.values())
+    rng = random.Random(f"{seed}:arrivals")
+    slots = asyncio.Semaphore(concurrency)
+    tasks = set()
+
+    async def request(operation: str, scheduled: float, request_rng):
+        async with slots:
+            await _call(client, workload, operation, request_rng,
+                        results if scheduled >= warmup_until else None, scheduled)
+
+    scheduled = time.perf_counter()
+    number = 0
+    while scheduled < deadline:
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        number += 1
+        task = asyncio.create_task(
+            request(rng.choices(names, weights)[0], scheduled, random.Random(f"{seed}:{number}"))
+        )
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        scheduled += rng.expovariate(rate)
+    await asyncio.gather(*tasks)
+
+async def run(args) -> dict:
+    mix = SCENARIOS[args.scenario]
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        workload = Workload()
+        await workload.discover(client, args.users, args.user_pool, args.sample_pages, random.Random(args.seed))
+
+        results = Results()
+        started = time.perf_counter()
+        warmup_until = started + args.warmup
+        deadline = warmup_until + args.duration
+        if args.rate:
+            await _open_loop(client, workload, mix, args.seed, args.concurrency, args.rate,
+                             warmup_until, deadline, results)
+        else:
+            await _closed_loop(client, workload, mix, args.seed, args.concurrency,
+                               warmup_until, deadline, results)
+        elapsed = time.perf_counter() - warmup_until
+
+    return {
+        "scenario": args.scenario,
+        "base_url": args.base_url,
+        "mode": f"open loop, {args.rate} req/s" if args.rate else "closed loop",
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "seed": args.seed,
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        **results.summary(elapsed),
+    }
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def print_report(report: dict):
+    print(f"\n{report['scenario']} ({report['mode']}, concurrency {report['concurrency']}, "
+          f"{report['duration_s']}s): {report['requests']} requests, {report['rps']} req/s")
+    print(f"{'endpoint':<24}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, e in report["endpoints"].items():
+        print(f"{name:<24}{e['requests']:>9}{e['errors']:>8}{e['rps']:>9}"
+              f"{e['p50_ms']:>10}{e['p95_ms']:>10}{e['p99_ms']:>10}")
+
+def compare(report: dict, baseline: dict, tolerance: float = TOLERANCE) -> list:
+    """Print the change against a baseline; returns the regressions found."""
+    for setting in ("scenario", "mode", "concurrency"):
+        if report[setting] != baseline.get(setting):
+            print(f"Note: {setting} differs from the baseline ({baseline.get(setting)!r})")
+
+    regressions = []
+    print(f"\nAgainst baseline of {baseline.get('recorded_at', '?')} (tolerance {tolerance:.0%}):")
+    print(f"{'endpoint':<24}{'req/s':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for name, e in report["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if not before:
+            print(f"{name:<24}{'(new)':>10}")
+            continue
+        change = lambda key: (e[key] - before[key]) / before[key] if before[key] else 0.0
+        flags = []
+        if change("rps") < -tolerance:
+            flags.append("throughput")
+        flags += [key for key in ("p95_ms", "p99_ms") if change(key) > tolerance]
+        if flags:
+            regressions.append((name, flags))
+        print(f"{name:<24}{change('rps'):>+10.0%}{change('p50_ms'):>+10.0%}"
+              f"{change('p95_ms'):>+10.0%}{change('p99_ms'):>+10.0%}"
+              + (f"  REGRESSION ({', '.join(flags)})" if flags else ""))
+    return regressions
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the elections API")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--scenario", choices=SCENARIOS, default="mixed")
+    parser.add_argument("--duration", type=float, default=60, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=10, help="Unmeasured seconds first")
+    parser.add_argument("--concurrency", type=int, default=50, help="Workers (closed loop) or in-flight cap (open loop)")
+    parser.add_argument("--rate", type=float, help="Open loop: Poisson arrivals per second")
+    parser.add_argument("--users", type=int, default=200, help="Virtual users to sign in")
+    parser.add_argument("--user-pool", type=int, default=20000, help="Synthetic users to pick them from")
+    parser.add_argument("--sample-pages", type=int, default=10, help="Event pages (of 100) to sample ids from")
+    parser.add_argument("--seed", type=int, default=2026)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--output", help="Write the report as JSON")
+    parser.add_argument("--baseline", help="Compare with a saved report; exit 1 on a regression")
+    parser.add_argument("--save-baseline", help="Save this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args(argv)
+
+    if httpx is None:
+        print("loadtest.py needs httpx (pip install httpx)", file=sys.stderr)
+        return 2
+
+    report = asyncio.run(run(args))
+    print_report(report)
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        if not os.path.exists(args.baseline):
+            print(f"\nNo baseline at {args.baseline}; save one with --save-baseline")
+            return 0
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
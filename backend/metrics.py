@@ -0,0 +1,350 @@
+"""
+Nepal Elections 2026 - Metrics
+Request, DB and cache metrics in the Prometheus text exposition format
+"""
+
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Optional
+import os
+import threading
+import time
+from starlette.routing import Match
+import cache
+import db
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0)
+ACQUIRE_BUCKETS = (0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Per-request DB time and statement count in a Server-Timing response header
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "on").lower() not in ("0", "off", "false")
+
+# Route label for DB work outside any request (folds, snapshot refreshes)
+BACKGROUND = "background"
+
+# ============================================================================
+# METRIC TYPES
+# ============================================================================
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self._values = {}  # label values -> count
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        """Caller holds the registry lock."""
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.label_names, labels)} {_number(value)}")
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: tuple, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self.label_names = labels
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, labels: tuple, value: float):
+        """Caller holds the registry lock."""
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+def scraped(name: str, kind: str, help: str, samples: list, label_names: tuple = ()) -> list:
+    """Exposition lines for a value read at scrape time: samples = [(labels, value)]."""
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_labels(label_names, labels)} {_number(value)}")
+    return lines
+
+# ============================================================================
+# REGISTRY
+# ============================================================================
+
+class _RequestTimings:
+    """DB work attributed to the request being served (via a context variable)."""
+    __slots__ = ("path", "query_seconds", "acquire_seconds", "shapes", "repeated")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.query_seconds = []  # one entry per statement
+        self.acquire_seconds = 0.0
+        self.shapes = {}         # statement shape -> count (profiler debug mode)
+        self.repeated = []       # shapes run more than the repeat threshold
+
+_current: ContextVar[Optional[_RequestTimings]] = ContextVar("metrics_request", default=None)
+
+def current() -> Optional[_RequestTimings]:
+    """Timings of the request being served on this thread / task, if any."""
+    return _current.get()
+
+def _server_timing(timings: _RequestTimings, elapsed: float) -> bytes:
+    entries = [
+        f'db;dur={sum(timings.query_seconds) * 1000:.1f};desc="{len(timings.query_seconds)} queries"',
+        f"db-pool;dur={timings.acquire_seconds * 1000:.1f}",
+        f"app;dur={elapsed * 1000:.1f}",
+    ]
+    for shape in timings.repeated:
+        desc = shape[:80].replace("\\", "").replace('"', "'")
+        entries.append(f'repeat;desc="{timings.shapes[shape]}x {desc}"')
+    return ", ".join(entries).encode("latin-1", "replace")
+
+class Registry:
+    """
+    Process-wide metrics.
+
+    Recording takes one short lock; everything derived (pool gauges, cache
+    ratios, in-memory store sizes) is read by collectors at scrape time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._collectors = []  # fn() -> exposition lines
+        self.in_flight = 0
+
+        self.requests = Counter(
+            "http_requests_total", "HTTP requests by route, method and status.",
+            ("route", "method", "status"),
+        )
+        self.request_seconds = Histogram(
+            "http_request_duration_seconds", "HTTP request latency (until the last body byte).",
+            REQUEST_BUCKETS, ("route", "method"),
+        )
+        self.queries = Counter(
+            "db_queries_total", "SQL statements executed, by route.", ("route",),
+        )
+        self.query_seconds = Histogram(
+            "db_query_duration_seconds", "SQL statement latency, by route.",
+            QUERY_BUCKETS, ("route",),
+        )
+        self.queries_per_request = Histogram(
+            "db_queries_per_request", "SQL statements per request, by route.",
+            (0, 1, 2, 3, 5, 10, 20, 50), ("route",),
+        )
+        self.acquire_seconds = Histogram(
+            "db_pool_acquire_wait_seconds", "Time spent waiting for a pooled connection, by route.",
+            ACQUIRE_BUCKETS, ("route",),
+        )
+
+    def add_collector(self, fn: Callable[[], list]):
+        self._collectors.append(fn)
+
+    # ------------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------------
+
+    def on_query(self, cursor, query, seconds: float):
+        timings = _current.get()
+        if timings is not None:
+            # No lock here: recorded per route when the request finishes
+            timings.query_seconds.append(seconds)
+            return
+        with self._lock:
+            self.queries.inc((BACKGROUND,))
+            self.query_seconds.observe((BACKGROUND,), seconds)
+
+    def on_acquire(self, seconds: float):
+        timings = _current.get()
+        if timings is not None:
+            timings.acquire_seconds += seconds
+            return
+        with self._lock:
+            self.acquire_seconds.observe((BACKGROUND,), seconds)
+
+    def record_request(self, route: str, method: str, status: int, seconds: float, timings: _RequestTimings):
+        with self._lock:
+            self.requests.inc((route, method, str(status)))
+            self.request_seconds.observe((route, method), seconds)
+            self.queries_per_request.observe((route,), len(timings.query_seconds))
+            if timings.query_seconds:
+                self.queries.inc((route,), len(timings.query_seconds))
+                for seconds in timings.query_seconds:
+                    self.query_seconds.observe((route,), seconds)
+                self.acquire_seconds.observe((route,), timings.acquire_seconds)
+
+    # ------------------------------------------------------------------------
+    # Exposition
+    # ------------------------------------------------------------------------
+
+    def render(self) -> bytes:
+        with self._lock:
+            lines = []
+            for metric in (
+                self.requests, self.request_seconds, self.queries,
+                self.query_seconds, self.queries_per_request, self.acquire_seconds,
+            ):
+                lines += metric.render()
+            in_flight = self.in_flight
+        lines += scraped("http_requests_in_flight", "gauge", "Requests currently being served.", [((), in_flight)])
+        for collector in self._collectors:
+            try:
+                lines += collector()
+            except Exception as e:
+                lines.append(f"# collector {getattr(collector, '__name__', collector)} failed: {_escape(e)}")
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+# ============================================================================
+# COLLECTORS
+# ============================================================================
+
+def pool_metrics() -> list:
+    stats = db.pool_stats()
+    if stats is None:
+        return []
+    return (
+        scraped("db_pool_connections", "gauge", "Pooled connections by state.",
+                [(("idle",), stats["idle"]), (("in_use",), stats["in_use"])], ("state",))
+        + scraped("db_pool_max_connections", "gauge", "Pool size limit.", [((), stats["max_size"])])
+        + scraped("db_pool_waiting", "gauge", "Threads waiting for a connection.", [((), stats["waiting"])])
+        + scraped("db_pool_acquired_total", "counter", "Connections checked out.", [((), stats["acquired_total"])])
+        + scraped("db_pool_timeouts_total", "counter", "Acquires that gave up.", [((), stats["timeouts_total"])])
+        + scraped("db_pool_recycled_total", "counter", "Connections closed instead of reused.",
+                  [((), stats["recycled_total"])])
+    )
+
+def cache_metrics() -> list:
+    caches = sorted(cache.instances(), key=lambda c: c.name)
+    labelled = lambda attr: [((c.name,), getattr(c, attr)) for c in caches]
+    return (
+        scraped("cache_hits_total", "counter", "In-process cache hits.", labelled("hits"), ("cache",))
+        + scraped("cache_misses_total", "counter", "In-process cache misses.", labelled("misses"), ("cache",))
+        + scraped("cache_evictions_total", "counter", "Entries evicted for size.", labelled("evictions"), ("cache",))
+        + scraped("cache_entries", "gauge", "Entries held.", [((c.name,), len(c)) for c in caches], ("cache",))
+        + scraped("cache_hit_ratio", "gauge", "Hits / lookups since start.",
+                  [((c.name,), c.stats()["hit_ratio"]) for c in caches], ("cache",))
+    )
+
+def replica_metrics() -> list:
+    stats = db.replica_stats()
+    if stats is None or not stats["replicas"]:
+        return []
+    replicas = stats["replicas"]
+    return (
+        scraped("db_replica_lag_seconds", "gauge", "Replay lag measured by the monitor.",
+                [((r["name"],), r["lag_seconds"]) for r in replicas if r["lag_seconds"] is not None],
+                ("replica",))
+        + scraped("db_replica_usable", "gauge", "1 while the replica is within the lag limit.",
+                  [((r["name"],), int(r["usable"])) for r in replicas], ("replica",))
+        + scraped("db_replica_reads_total", "counter", "Opted-in reads by where they ran.",
+                  [(("replica",), stats["replica_reads_total"]),
+                   (("primary_fallback",), stats["fallbacks_total"]),
+                   (("primary_behind",), stats["behind_total"]),
+                   (("primary_pinned",), stats["pinned_total"]),
+                   (("primary_retry",), stats["retries_total"])], ("outcome",))
+    )
+
+registry = Registry()
+registry.add_collector(pool_metrics)
+registry.add_collector(cache_metrics)
+registry.add_collector(replica_metrics)
+db.observe_queries(registry.on_query)
+db.observe_acquires(registry.on_acquire)
+
+# ============================================================================
+# MIDDLEWARE
+# ============================================================================
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware timing every HTTP request.
+
+    Requests are labelled by route template (/election/v1/events/{event_id}),
+    never by raw path, so label cardinality stays fixed. DB statements and
+    pool waits made while serving a request are attributed to its route
+    through a context variable, which the threadpool carries along, and
+    summed into a Server-Timing header.
+    """
+
+    def __init__(self, app, routes: list, registry: Registry = registry):
+        self.app = app
+        self.routes = routes
+        self.registry = registry
+        self._templates = {}  # endpoint -> path template
+
+    def _route(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            # Answered before routing (an early 304) or no route at all
+            for route in self.routes:
+                if route.matches(scope)[0] == Match.FULL:
+                    return route.path
+            return "unmatched"
+        template = self._templates.get(endpoint)
+        if template is None:
+            self._templates = {
+                getattr(route, "endpoint", None): route.path
+                for route in self.routes if hasattr(route, "path")
+            }
+            template = self._templates.get(endpoint, "unmatched")
+        return template
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timings = _RequestTimings(scope["path"])
+        token = _current.set(timings)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if SERVER_TIMING:
+                    # DB work up to the headers; a streamed body's later queries aren't in it
+                    header = _server_timing(timings, time.perf_counter() - started)
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", header)]
+            await send(message)
+
+        self.registry.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.registry.in_flight -= 1
+            _current.reset(token)
+            self.registry.record_request(
+                self._route(scope), scope["method"], status, time.perf_counter() - started, timings
+            )
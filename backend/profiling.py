@@ -0,0 +1,210 @@
+"""
+Nepal Elections 2026 - Query Profiling
+Slow-query log with sampled EXPLAIN plans, and repeated-statement detection
+"""
+
+from collections import deque
+from typing import Optional
+import os
+import queue
+import random
+import re
+import threading
+import time
+import db
+import metrics
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Statements at least this slow are logged
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "250"))
+
+# Share of slow statements whose plan is captured with EXPLAIN (ANALYZE, BUFFERS)
+EXPLAIN_SAMPLE_RATE = float(os.environ.get("SLOW_QUERY_EXPLAIN_RATE", "0.1"))
+
+# At most one captured plan per statement shape per interval (seconds)
+EXPLAIN_INTERVAL = float(os.environ.get("SLOW_QUERY_EXPLAIN_INTERVAL", "300"))
+
+# Plans are captured by one background thread; beyond this backlog they are dropped
+EXPLAIN_QUEUE_SIZE = 8
+EXPLAIN_TIMEOUT_MS = int(os.environ.get("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", "10000"))
+
+# Debug mode: flag requests that run one statement shape more than REPEAT_THRESHOLD times
+DEBUG = os.environ.get("QUERY_DEBUG", "").lower() in ("1", "on", "true")
+REPEAT_THRESHOLD = int(os.environ.get("QUERY_REPEAT_THRESHOLD", "10"))
+
+RECENT_SLOW = 50
+
+# ============================================================================
+# STATEMENT SHAPES
+# ============================================================================
+
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LISTS = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+_SPACE = re.compile(r"\s+")
+
+def shape(query) -> str:
+    """
+    Statement text with literals and IN-lists collapsed, so the same query
+    with different parameters (or a different number of them) matches.
+    """
+    if isinstance(query, bytes):
+        query = query.decode("utf-8", "replace")
+    text = _STRINGS.sub("?", str(query))
+    text = _NUMBERS.sub("?", text)
+    text = _LISTS.sub("(...)", text)
+    return _SPACE.sub(" ", text).strip()
+
+def _text(cursor, query) -> str:
+    if isinstance(query, (str, bytes)):
+        return query
+    return query.as_string(cursor)  # psycopg2.sql composables
+
+# ============================================================================
+# PROFILER
+# ============================================================================
+
+class QueryProfiler:
+    """
+    Query observer behind the slow-query log and the repeat detector.
+
+    Plans are captured off the request path: a sampled slow statement is
+    re-run as EXPLAIN (ANALYZE, BUFFERS) by one background thread, on its
+    own pooled connection, in a read-only transaction with a timeout.
+    Sampling, a per-shape interval and a bounded queue keep the capture
+    from adding load when the database is already struggling.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=EXPLAIN_QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._explained = {}  # shape -> monotonic time of the last capture
+        self.recent = deque(maxlen=RECENT_SLOW)
+
+        self.slow_total = 0
+        self.explains_total = 0
+        self.explain_failures_total = 0
+        self.explains_dropped_total = 0
+        self.repeat_flags_total = 0
+
+    # ------------------------------------------------------------------------
+    # Observer (runs on the thread that ran the query)
+    # ------------------------------------------------------------------------
+
+    def on_query(self, cursor, query, seconds: float):
+        timings = metrics.current()
+        slow = seconds * 1000 >= SLOW_QUERY_MS
+        if not slow and not (DEBUG and timings is not None):
+            return
+
+        statement = shape(_text(cursor, query))
+        if statement.startswith("EXPLAIN"):
+            return  # our own captures
+        if DEBUG and timings is not None:
+            self._count(timings, statement)
+        if slow:
+            self._slow(cursor, statement, seconds, timings)
+
+    def _count(self, timings, statement: str):
+        count = timings.shapes.get(statement, 0) + 1
+        timings.shapes[statement] = count
+        if count == REPEAT_THRESHOLD + 1:
+            timings.repeated.append(statement)
+            self.repeat_flags_total += 1
+            print(f"Repeated statement (>{REPEAT_THRESHOLD}x) on {timings.path}: {statement[:300]}")
+
+    def _slow(self, cursor, statement: str, seconds: float, timings):
+        entry = {
+            "at": time.time(),
+            "path": timings.path if timings is not None else metrics.BACKGROUND,
+            "ms": round(seconds * 1000, 1),
+            "statement": statement,
+            "plan": None,
+        }
+        with self._lock:
+            self.slow_total += 1
+            self.recent.append(entry)
+        print(f"Slow query ({entry['ms']:.0f} ms) on {entry['path']}: {statement[:300]}")
+
+        if self._should_explain(cursor, statement):
+            try:
+                self._queue.put_nowait((cursor.query, entry))
+            except queue.Full:
+                self.explains_dropped_total += 1
+
+    def _should_explain(self, cursor, statement: str) -> bool:
+        if self._thread is None or random.random() >= EXPLAIN_SAMPLE_RATE:
+            return False
+        # Only plain reads; named cursors only ran a DECLARE
+        if getattr(cursor, "name", None) is not None or cursor.query is None:
+            return False
+        if not statement.upper().startswith(("SELECT", "WITH")):
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if now - self._explained.get(statement, -EXPLAIN_INTERVAL) < EXPLAIN_INTERVAL:
+                return False
+            self._explained[statement] = now
+        return True
+
+    # ------------------------------------------------------------------------
+    # Plan capture (background thread)
+    # ------------------------------------------------------------------------
+
+    def explain(self, bound_query: bytes) -> str:
+        """Plan of one already-bound statement; writes are refused by the read-only transaction."""
+        with db.get_db() as conn:
+            cur = conn.cursor()
+            cur.execute("SET TRANSACTION READ ONLY")
+            cur.execute(f"SET LOCAL statement_timeout = {EXPLAIN_TIMEOUT_MS}")
+            cur.execute(b"EXPLAIN (ANALYZE, BUFFERS) " + bound_query)
+            plan = "\n".join(row["QUERY PLAN"] for row in cur.fetchall())
+            conn.rollback()
+            return plan
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            bound_query, entry = item
+            try:
+                entry["plan"] = self.explain(bound_query)
+                self.explains_total += 1
+                print(f"Plan for slow query on {entry['path']} ({entry['ms']:.0f} ms):\n{entry['plan']}")
+            except Exception as e:
+                self.explain_failures_total += 1
+                print(f"Slow query plan capture failed: {e}")
+
+    def start(self):
+        if self._thread is None and EXPLAIN_SAMPLE_RATE > 0:
+            self._thread = threading.Thread(target=self._run, name="query-explain", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                return  # daemon thread; it goes down with the process
+            thread.join(timeout=EXPLAIN_TIMEOUT_MS / 1000)
+
+    def stats(self) -> dict:
+        return {
+            "slow_query_ms": SLOW_QUERY_MS,
+            "explain_sample_rate": EXPLAIN_SAMPLE_RATE,
+            "debug": DEBUG,
+            "slow_total": self.slow_total,
+            "explains_total": self.explains_total,
+            "explain_failures_total": self.explain_failures_total,
+            "explains_dropped_total": self.explains_dropped_total,
+            "repeat_flags_total": self.repeat_flags_total,
+        }
+
+profiler = QueryProfiler()
+db.observe_queries(profiler.on_query)
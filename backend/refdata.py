@@ -0,0 +1,83 @@
+"""
+Nepal Elections 2026 - Reference Data Cache
+Versioned in-memory copies of parties, constituencies and other small tables
+"""
+
+from typing import Any, Callable, Iterable, Optional
+import threading
+import time
+from starlette.concurrency import run_in_threadpool
+import db
+
+class ReferenceCache:
+    """
+    Serves rarely-changing reference data without DB round trips.
+
+    Each table is registered with a loader `fn(cursor) -> value` that runs
+    the query and does any expensive serialization once. A table is
+    reloaded when the change listener reports a write to it, and the cache
+    version is bumped on every (re)load so responses can be tagged with it.
+    """
+
+    def __init__(self):
+        self._loaders = {}    # table -> loader
+        self._data = {}       # table -> loaded value
+        self._loaded_at = {}  # table -> unix time
+        self._lock = threading.Lock()
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.reloads_total = 0
+
+    def register(self, table: str, loader: Callable[[Any], Any]):
+        self._loaders[table] = loader
+
+    @property
+    def tables(self) -> list:
+        return list(self._loaders)
+
+    def load(self, tables: Optional[Iterable[str]] = None):
+        """(Re)load tables from the database in one transaction."""
+        tables = list(tables) if tables is not None else self.tables
+        with db.get_db() as conn:
+            cur = conn.cursor()
+            loaded = {table: self._loaders[table](cur) for table in tables}
+
+        with self._lock:
+            self._data.update(loaded)
+            now = time.time()
+            for table in loaded:
+                self._loaded_at[table] = now
+            self.version += 1
+            self.reloads_total += 1
+
+    async def fetch(self, table: str) -> Any:
+        """Cached value for a table, loading it on first use."""
+        value = self._data.get(table)
+        if value is None:
+            self.misses += 1
+            await run_in_threadpool(self.load, [table])
+            return self._data[table]
+        self.hits += 1
+        return value
+
+    def on_table_changed(self, table: Optional[str]):
+        """Change-listener callback; payload None means resync everything."""
+        if table is None:
+            self.load()
+        elif table in self._loaders:
+            self.load([table])
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "version": self.version,
+            "tables": {
+                table: {"loaded_at": self._loaded_at.get(table)}
+                for table in self._loaders
+            },
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "reloads_total": self.reloads_total,
+        }
@@ -0,0 +1,138 @@
+"""
+Nepal Elections 2026 - Response Rendering
+Postgres-built event JSON and fast serialization of dict responses
+"""
+
+from decimal import Decimal
+from typing import Optional
+import json
+import os
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the stdlib encoder
+    orjson = None
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# render= values: "python" builds dicts per row, "db" has Postgres build
+# each event's JSON (json_build_object) so rows are only concatenated
+RENDER_MODES = "^(python|db)$"
+DEFAULT_RENDER_MODE = os.environ.get("JSON_RENDER_MODE", "python")
+
+# ============================================================================
+# SERIALIZATION
+# ============================================================================
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content) -> bytes:
+    """Compact JSON bytes (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+def json_response(content: dict) -> Response:
+    """Response for an already JSON-shaped dict, skipping jsonable_encoder."""
+    return Response(dumps(content), media_type="application/json")
+
+def page_response(head: dict, items: list, tail: dict) -> Response:
+    """
+    {**head, "data": [items], **tail} where items are JSON texts built by
+    Postgres; they are concatenated, never parsed.
+    """
+    parts = [dumps(head)[:-1]] if head else [b"{"]
+    parts.append(b"," if head else b"")
+    parts.append(b'"data":[' + ",".join(items).encode("utf-8") + b"]")
+    if tail:
+        parts.append(b"," + dumps(tail)[1:])
+    else:
+        parts.append(b"}")
+    return Response(b"".join(parts), media_type="application/json")
+
+# ============================================================================
+# EVENT JSON IN SQL
+# ============================================================================
+# Mirrors EVENT_FIELDS / row_to_event in main.py expression for expression,
+# including the "falsy -> null" rules of the nested objects. The golden
+# test (tests/e2e/e2e-08-render-modes.spec.js) compares both modes.
+
+def _isoformat(column: str) -> str:
+    """datetime.isoformat() of a timestamptz (microseconds only when non-zero)."""
+    return (
+        f"CASE WHEN {column} IS NOT NULL THEN "
+        f"to_char({column}, 'YYYY-MM-DD\"T\"HH24:MI:SS')"
+        f" || CASE WHEN to_char({column}, 'US') <> '000000' THEN '.' || to_char({column}, 'US') ELSE '' END"
+        f" || to_char({column}, 'TZH:TZM') END"
+    )
+
+EVENT_FIELD_SQL = {
+    "id": "id",
+    "title": "title",
+    "title_nepali": "title_nepali",
+    "party_id": "party_id",
+    "constituency_id": "constituency_id",
+    "type": "event_type",
+    "status": "status",
+    "description": "description",
+    "datetime": _isoformat("datetime"),
+    "end_time": _isoformat("end_time"),
+    "speakers": "COALESCE(to_json(speakers), '[]'::json)",
+    "expected_attendance": "expected_attendance",
+    "rsvp_count": "rsvp_count",
+    "venue": """CASE WHEN venue_name <> '' THEN json_build_object(
+        'name', venue_name,
+        'address', venue_address,
+        'coordinates', CASE WHEN venue_lat <> 0 THEN json_build_array(venue_lat, venue_lng) END
+    ) END""",
+    "party": """CASE WHEN party_name <> '' THEN json_build_object(
+        'id', party_id,
+        'name', party_name,
+        'short_name', party_short_name,
+        'color', party_color
+    ) END""",
+    "constituency": """CASE WHEN constituency_name <> '' THEN json_build_object(
+        'id', constituency_id,
+        'name', constituency_name,
+        'province', province,
+        'district', district,
+        'registered_voters', 0
+    ) END""",
+    "tags": "COALESCE(to_json(tags), '[]'::json)",
+}
+
+MAP_TUPLE_SQL = "json_build_array(id, venue_lat, venue_lng, event_type, party_color, title)"
+
+def event_json_column(cur, fields: Optional[tuple], view: str, user: Optional[dict]) -> str:
+    """
+    SELECT-list item `event_json` rendering one events_read row as the API
+    would, for the given projection. The user id is inlined as a quoted
+    literal so the expression can be dropped into any query.
+    """
+    if view == "map" and fields is None:
+        return f"{MAP_TUPLE_SQL}::text AS event_json"
+
+    names = [name for name in (fields or EVENT_FIELD_SQL) if name != "user_rsvp"]
+    pairs = [f"'{name}', {EVENT_FIELD_SQL[name]}" for name in names]
+
+    if fields is None or "user_rsvp" in fields:
+        if user:
+            user_id = cur.mogrify("%s", (user["id"],)).decode().replace("%", "%%")
+            pairs.append(
+                "'user_rsvp', (SELECT r.status FROM rsvps r "
+                f"WHERE r.user_id = {user_id} AND r.event_id = events_read.id)"
+            )
+        else:
+            pairs.append("'user_rsvp', NULL")
+
+    return f"json_build_object({', '.join(pairs)})::text AS event_json"
@@ -0,0 +1,392 @@
+"""
+Nepal Elections 2026 - Upcoming Events Snapshot
+Columnar in-memory copy of upcoming confirmed events for DB-free listing
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import asyncio
+import os
+import threading
+import time
+from starlette.concurrency import run_in_threadpool
+import db
+
+try:
+    import numpy as np
+except ImportError:  # Optional: every request then takes the SQL path
+    np = None
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SNAPSHOT_ENABLED = os.environ.get("EVENT_SNAPSHOT", "1") == "1"
+
+# Events starting before now - lookback are not kept
+LOOKBACK_HOURS = float(os.environ.get("EVENT_SNAPSHOT_LOOKBACK_HOURS", "0"))
+
+# How often pending changes are applied, and how often everything is reloaded
+# (a safety net for anything the change notifications missed)
+REFRESH_INTERVAL = float(os.environ.get("EVENT_SNAPSHOT_REFRESH_INTERVAL", "1.0"))
+REBUILD_INTERVAL = float(os.environ.get("EVENT_SNAPSHOT_REBUILD_INTERVAL", "300"))
+
+# Fraction of snapshot-served requests re-run against SQL and compared
+VERIFY_RATE = float(os.environ.get("EVENT_SNAPSHOT_VERIFY_RATE", "0.01"))
+
+# How long events_read_changes rows are kept (sql/014_events_read_changes.sql);
+# far longer than REBUILD_INTERVAL, so no snapshot skips a change
+CHANGE_RETENTION_SECONDS = 3600
+
+EARTH_RADIUS_METERS = 6371008.8
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def epoch_us(value) -> Optional[int]:
+    """datetime or ISO date/datetime string -> epoch microseconds (naive means UTC)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+def _encode(values: list, codes: dict):
+    """Map strings to int codes (-1 for None) so filters compare integers."""
+    return np.array(
+        [codes.setdefault(v, len(codes)) if v is not None else -1 for v in values],
+        dtype=np.int32,
+    )
+
+class _Columns:
+    """Immutable column arrays built from a list of events_read rows."""
+
+    def __init__(self, rows: list):
+        self.rows = rows
+        self.codes = {"party": {}, "constituency": {}, "type": {}}
+        self.ids = np.array([row["id"] for row in rows], dtype=object)
+        self.datetime = np.array([epoch_us(row["datetime"]) for row in rows], dtype=np.int64)
+        self.rsvp_count = np.array([row.get("rsvp_count") or 0 for row in rows], dtype=np.int64)
+        self.party = _encode([row.get("party_id") for row in rows], self.codes["party"])
+        self.constituency = _encode([row.get("constituency_id") for row in rows], self.codes["constituency"])
+        self.type = _encode([row.get("event_type") for row in rows], self.codes["type"])
+        self.lat = np.array(
+            [row["venue_lat"] if row.get("venue_lat") is not None else np.nan for row in rows],
+            dtype=np.float64,
+        )
+        self.lng = np.array(
+            [row["venue_lng"] if row.get("venue_lng") is not None else np.nan for row in rows],
+            dtype=np.float64,
+        )
+
+        # Tie-break rank matching "ORDER BY ..., id"
+        self.id_rank = np.empty(len(rows), dtype=np.int64)
+        self.id_rank[np.argsort(self.ids.astype(str), kind="stable")] = np.arange(len(rows))
+
+    def code(self, column: str, value: str) -> int:
+        return self.codes[column].get(value, -2)  # -2 matches nothing
+
+# ============================================================================
+# SNAPSHOT
+# ============================================================================
+
+class EventSnapshot:
+    """
+    Upcoming confirmed events held as NumPy columns.
+
+    Serves list_events / list_events_nearby requests whose filters fall
+    inside its scope (status=confirmed and date_from at or after the
+    horizon); everything else returns None and the caller uses SQL.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = {}           # id -> events_read row
+        self._cols: Optional[_Columns] = None
+        self.version = 0  # bumped on every publish
+        self.horizon: Optional[int] = None  # epoch microseconds
+        self._xmin: Optional[str] = None  # xid8 watermark of the last read
+        self._dirty = False
+        self._rebuild_needed = True
+        self._last_rebuild = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+        self.served_total = 0
+        self.fallthrough_total = 0
+        self.verified_total = 0
+        self.mismatches_total = 0
+        self.rebuilds_total = 0
+        self.refreshes_total = 0
+
+    @property
+    def available(self) -> bool:
+        return SNAPSHOT_ENABLED and np is not None and self._cols is not None
+
+    # ------------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------------
+
+    def _in_scope(self, row: dict) -> bool:
+        return (
+            row.get("status") == "confirmed"
+            and row.get("datetime") is not None
+            and epoch_us(row["datetime"]) >= self.horizon
+        )
+
+    def _publish(self):
+        cols = _Columns(list(self._rows.values()))
+        with self._lock:
+            self._cols = cols
+            self.version += 1
+
+    def columns(self) -> tuple:
+        """(version, columns) of the current snapshot; columns may be None."""
+        with self._lock:
+            return self.version, self._cols
+
+    def rebuild(self):
+        """Reload every in-scope event."""
+        horizon = datetime.now(timezone.utc) - timedelta(hours=LOOKBACK_HOURS)
+        with db.get_db() as conn:
+            cur = conn.cursor()
+            # Same statement, same snapshot: rows and the watermark agree
+            cur.execute("""
+                SELECT *, pg_snapshot_xmin(pg_current_snapshot())::text AS xmin
+                FROM events_read
+                WHERE status = 'confirmed' AND datetime >= %s
+            """, (horizon,))
+            rows = cur.fetchall()
+            if not rows:
+                cur.execute("SELECT pg_snapshot_xmin(pg_current_snapshot())::text AS xmin")
+                xmin = cur.fetchone()["xmin"]
+            else:
+                xmin = rows[0]["xmin"]
+            cur.execute(
+                "SELECT prune_events_read_changes(%s * interval '1 second')", (CHANGE_RETENTION_SECONDS,)
+            )
+
+        self.horizon = epoch_us(horizon)
+        self._rows = {}
+        for row in rows:
+            row = dict(row)
+            row.pop("xmin")
+            self._rows[row["id"]] = row
+        self._xmin = xmin
+        self._publish()
+        self._rebuild_needed = False
+        self._dirty = False
+        self._last_rebuild = time.monotonic()
+        self.rebuilds_total += 1
+
+    def refresh(self):
+        """
+        Re-read the events written by every transaction that had not
+        finished at the previous read (xid at or above its xmin), however
+        late it committed. Ids no longer in events_read were deleted.
+        """
+        self._dirty = False
+        if self._xmin is None:
+            return self.rebuild()
+
+        with db.get_db() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT pg_snapshot_xmin(pg_current_snapshot())::text AS xmin,
+                       ARRAY(
+                         SELECT DISTINCT unnest(event_ids)
+                         FROM events_read_changes
+                         WHERE xid >= %s::xid8
+                       ) AS ids
+            """, (self._xmin,))
+            marker = cur.fetchone()
+            rows = []
+            if marker["ids"]:
+                cur.execute("SELECT * FROM events_read WHERE id = ANY(%s)", (marker["ids"],))
+                rows = cur.fetchall()
+
+        current = {row["id"]: row for row in rows}
+        for event_id in marker["ids"]:
+            row = current.get(event_id)
+            if row is not None and self._in_scope(row):
+                self._rows[event_id] = dict(row)
+            else:
+                self._rows.pop(event_id, None)
+        self._xmin = marker["xmin"]
+
+        if marker["ids"]:
+            self._publish()
+        self.refreshes_total += 1
+
+    def on_table_changed(self, table: Optional[str]):
+        """Change-listener callback (runs on the listener thread)."""
+        if table == "events":
+            self._dirty = True
+        elif table in (None, "event_tags", "venues", "parties", "constituencies"):
+            self._rebuild_needed = True
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(REFRESH_INTERVAL)
+            try:
+                if self._rebuild_needed or time.monotonic() - self._last_rebuild > REBUILD_INTERVAL:
+                    await run_in_threadpool(self.rebuild)
+                elif self._dirty:
+                    await run_in_threadpool(self.refresh)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Event snapshot refresh failed: {e}")
+
+    def start(self):
+        if SNAPSHOT_ENABLED and np is not None and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ------------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------------
+
+    def covers(self, status: Optional[str], date_from: Optional[str], date_to: Optional[str] = None) -> bool:
+        """Whether a request's filters fall entirely inside the snapshot."""
+        if not self.available:
+            return False
+        try:
+            start = epoch_us(date_from)
+            epoch_us(date_to)
+        except ValueError:
+            # Let Postgres parse (or reject) anything fromisoformat can't
+            start = None
+        if status != "confirmed" or start is None or start < self.horizon:
+            self.fallthrough_total += 1
+            return False
+        return True
+
+    def _mask(self, cols: _Columns, constituency_id, party_id, event_type, date_from, date_to):
+        mask = cols.datetime >= epoch_us(date_from)
+        if date_to:
+            mask &= cols.datetime <= epoch_us(date_to)
+        if constituency_id:
+            mask &= cols.constituency == cols.code("constituency", constituency_id)
+        if party_id:
+            mask &= cols.party == cols.code("party", party_id)
+        if event_type:
+            mask &= cols.type == cols.code("type", event_type)
+        return mask
+
+    def list_events(
+        self,
+        *,
+        constituency_id: Optional[str],
+        party_id: Optional[str],
+        event_type: Optional[str],
+        date_from: str,
+        date_to: Optional[str],
+        sort_col: str,
+        sort_dir: str,
+        offset: int,
+        limit: int,
+        after: Optional[tuple] = None,
+    ) -> tuple:
+        """
+        Filter, sort and page like list_events' SQL.
+
+        Returns (rows, total, has_more); `after` is a decoded keyset cursor
+        (sort value, id).
+        """
+        with self._lock:
+            cols = self._cols
+
+        mask = self._mask(cols, constituency_id, party_id, event_type, date_from, date_to)
+        total = int(mask.sum())
+
+        key = cols.datetime if sort_col == "datetime" else cols.rsvp_count
+        if after is not None:
+            value, last_id = after
+            value = epoch_us(value) if sort_col == "datetime" else int(value)
+            if sort_dir == "ASC":
+                mask &= (key > value) | ((key == value) & (cols.ids > last_id))
+            else:
+                mask &= (key < value) | ((key == value) & (cols.ids < last_id))
+
+        idx = np.nonzero(mask)[0]
+        if sort_dir == "ASC":
+            order = np.lexsort((cols.id_rank[idx], key[idx]))
+        else:
+            order = np.lexsort((-cols.id_rank[idx], -key[idx]))
+        selected = idx[order][offset:offset + limit + 1]
+
+        self.served_total += 1
+        return [cols.rows[i] for i in selected[:limit]], total, len(selected) > limit
+
+    def nearby(
+        self,
+        lat: float,
+        lng: float,
+        radius: float,
+        limit: int,
+        date_from: str,
+        date_to: Optional[str] = None,
+    ) -> list:
+        """Events within `radius` meters by vectorized haversine, nearest first."""
+        with self._lock:
+            cols = self._cols
+
+        mask = self._mask(cols, None, None, None, date_from, date_to) & ~np.isnan(cols.lat)
+
+        lat1, lng1 = np.radians(lat), np.radians(lng)
+        lat2, lng2 = np.radians(cols.lat), np.radians(cols.lng)
+        a = (
+            np.sin((lat2 - lat1) / 2) ** 2
+            + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+        )
+        distance = 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+        mask &= distance <= radius
+        idx = np.nonzero(mask)[0]
+        idx = idx[np.argsort(distance[idx], kind="stable")][:limit]
+
+        self.served_total += 1
+        return [{**cols.rows[i], "distance_meters": float(distance[i])} for i in idx]
+
+    # ------------------------------------------------------------------------
+    # Consistency
+    # ------------------------------------------------------------------------
+
+    def record_verification(self, kind: str, snapshot_ids: list, sql_ids: list):
+        """Compare ids served from the snapshot with the SQL path's."""
+        self.verified_total += 1
+        if snapshot_ids != sql_ids:
+            self.mismatches_total += 1
+            print(
+                f"Event snapshot mismatch ({kind}): "
+                f"snapshot={snapshot_ids[:10]} sql={sql_ids[:10]}"
+            )
+
+    def stats(self) -> dict:
+        cols = self._cols
+        return {
+            "available": self.available,
+            "events": len(cols.rows) if cols is not None else 0,
+            "horizon": (EPOCH + timedelta(microseconds=self.horizon)).isoformat() if self.horizon is not None else None,
+            "served_total": self.served_total,
+            "fallthrough_total": self.fallthrough_total,
+            "verified_total": self.verified_total,
+            "mismatches_total": self.mismatches_total,
+            "rebuilds_total": self.rebuilds_total,
+            "refreshes_total": self.refreshes_total,
+        }
+
+snapshot = EventSnapshot()
@@ -0,0 +1,110 @@
+"""
+Nepal Elections 2026 - Constituency Spatial Index
+In-memory STRtree over constituency polygons for point-in-polygon lookups
+"""
+
+from typing import List, Optional, Sequence
+import json
+import threading
+import db
+
+try:
+    import numpy as np
+    import shapely
+    from shapely.geometry import shape
+except ImportError:  # Optional: detection falls back to PostGIS
+    shapely = None
+
+class ConstituencyIndex:
+    """
+    STRtree of prepared constituency polygons.
+
+    Candidate polygons come from the tree's bounding-box query and are
+    confirmed with prepared-geometry intersects, so a lookup touches only
+    the few polygons whose bbox contains the point. A point exactly on a
+    shared boundary resolves to the first polygon by id, as in the PostGIS
+    fallback (ST_Covers). `available` is False until the first successful
+    load (or when shapely isn't installed); callers then use the database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tree = None
+        self._ids = []
+        self._geoms = None
+        self.lookups = 0
+        self.points_resolved = 0
+        self.loads_total = 0
+
+    @property
+    def available(self) -> bool:
+        return self._tree is not None
+
+    def load(self):
+        """(Re)build the index from the constituencies table."""
+        if shapely is None:
+            return
+        with db.get_db() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT id, ST_AsGeoJSON(bounds) AS bounds_geojson
+                FROM constituencies
+                WHERE bounds IS NOT NULL
+                ORDER BY id
+            """)
+            rows = cur.fetchall()
+
+        ids = [row["id"] for row in rows]
+        geoms = np.array([shape(json.loads(row["bounds_geojson"])) for row in rows], dtype=object)
+        shapely.prepare(geoms)
+        tree = shapely.STRtree(geoms)
+
+        with self._lock:
+            self._ids, self._geoms, self._tree = ids, geoms, tree
+            self.loads_total += 1
+
+    def on_table_changed(self, table: Optional[str]):
+        """Change-listener callback."""
+        if table in (None, "constituencies"):
+            self.load()
+
+    def locate(self, lat: float, lng: float) -> Optional[str]:
+        """Constituency id containing the point, or None."""
+        return self.locate_many([(lat, lng)])[0]
+
+    def locate_many(self, points: Sequence[Sequence[float]]) -> List[Optional[str]]:
+        """Constituency id (or None) for each (lat, lng) point."""
+        with self._lock:
+            ids, geoms, tree = self._ids, self._geoms, self._tree
+
+        coords = np.asarray(points, dtype=float).reshape(-1, 2)
+        query_points = shapely.points(coords[:, 1], coords[:, 0])
+
+        # Bounding-box candidates, then exact test against prepared polygons
+        point_idx, geom_idx = tree.query(query_points)
+        hits = shapely.intersects(geoms[geom_idx], query_points[point_idx])
+
+        # The tree yields candidates in tree order; a point on a shared
+        # boundary takes the lowest index, i.e. the first polygon by id
+        first = np.full(len(coords), len(ids), dtype=np.int64)
+        np.minimum.at(first, point_idx[hits], geom_idx[hits])
+
+        result: List[Optional[str]] = [
+            ids[g] if g < len(ids) else None for g in first.tolist()
+        ]
+
+        self.lookups += 1
+        self.points_resolved += len(coords)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "available": self.available,
+            "backend": "shapely-strtree" if shapely is not None else "postgis",
+            "polygons": len(self._ids),
+            "lookups": self.lookups,
+            "points_resolved": self.points_resolved,
+            "loads_total": self.loads_total,
+        }
+
+index = ConstituencyIndex()
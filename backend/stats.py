@@ -0,0 +1,93 @@
+"""
+Nepal Elections 2026 - Event Statistics
+Reads of the event_stats rollup (sql/013_event_stats.sql)
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Rollup days are Nepal calendar days; Nepal has no daylight saving time
+NEPAL_TZ = timezone(timedelta(hours=5, minutes=45))
+
+# Longest range one /stats/daily request may cover
+MAX_DAILY_DAYS = 366
+
+SCOPES = ("all", "party", "constituency")
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+# Each reads at most (keys in the scope) x (campaign days) rollup rows; the
+# number of events and RSVPs never enters into it.
+
+def today() -> date:
+    """The current Nepal date; events on it or later are upcoming."""
+    return datetime.now(NEPAL_TZ).date()
+
+def counts(row: Optional[dict]) -> dict:
+    """API counts from a totals row; zeros for None."""
+    row = row or {}
+    return {
+        "events": int(row.get("events") or 0),
+        "upcoming_events": int(row.get("upcoming_events") or 0),
+        "cancelled_events": int(row.get("cancelled_events") or 0),
+        "going_rsvps": int(row.get("going_rsvps") or 0),
+    }
+
+def totals(cur, scope: str, as_of: date) -> dict:
+    """key -> counts for every key in a scope ('' for unassigned events)."""
+    cur.execute("""
+        SELECT key,
+               SUM(events) AS events,
+               SUM(events) FILTER (WHERE day >= %s) AS upcoming_events,
+               SUM(cancelled) AS cancelled_events,
+               SUM(going) AS going_rsvps
+        FROM event_stats
+        WHERE scope = %s
+        GROUP BY key
+    """, (as_of, scope))
+    return {row["key"]: counts(row) for row in cur.fetchall()}
+
+def overview(cur, as_of: date) -> dict:
+    return totals(cur, "all", as_of).get("", counts(None))
+
+def extent(cur, scope: str, key: str) -> tuple:
+    """(first day, last day) with rollup rows for a key, or (None, None)."""
+    cur.execute("""
+        SELECT MIN(day) AS first, MAX(day) AS last
+        FROM event_stats
+        WHERE scope = %s AND key = %s
+    """, (scope, key))
+    row = cur.fetchone()
+    return row["first"], row["last"]
+
+def daily(cur, scope: str, key: str, start: date, end: date) -> list:
+    """Counts for each day in [start, end], days without events included."""
+    cur.execute("""
+        SELECT day, events, cancelled, going
+        FROM event_stats
+        WHERE scope = %s AND key = %s AND day BETWEEN %s AND %s
+    """, (scope, key, start, end))
+    by_day = {row["day"]: row for row in cur.fetchall()}
+
+    days = []
+    for offset in range((end - start).days + 1):
+        day = start + timedelta(days=offset)
+        row = by_day.get(day) or {}
+        days.append({
+            "date": day.isoformat(),
+            "events": row.get("events", 0),
+            "cancelled_events": row.get("cancelled", 0),
+            "going_rsvps": row.get("going", 0),
+        })
+    return days
+
+def turnout_ratio(going: int, registered_voters: Optional[int]) -> Optional[float]:
+    """'Going' RSVPs per registered voter; None without a voter count."""
+    if not registered_voters:
+        return None
+    return round(going / registered_voters, 6)
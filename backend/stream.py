@@ -0,0 +1,277 @@
+"""
+Nepal Elections 2026 - Live Event Stream
+Fans event_changed notifications (sql/011) out to server-sent event clients
+"""
+
+from typing import Iterable, Optional
+import asyncio
+import json
+import os
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Changes to one event inside an interval are merged into one message
+INTERVAL = float(os.environ.get("EVENT_STREAM_INTERVAL", "1.0"))
+
+# Comment line sent on idle streams so proxies don't close them
+HEARTBEAT = float(os.environ.get("EVENT_STREAM_HEARTBEAT", "15"))
+
+# Reconnect delay suggested to EventSource clients (milliseconds)
+RETRY_MS = int(os.environ.get("EVENT_STREAM_RETRY_MS", "3000"))
+
+MAX_SUBSCRIBERS = int(os.environ.get("EVENT_STREAM_MAX_SUBSCRIBERS", "2000"))
+MAX_EVENT_IDS = 200
+
+# A client this many distinct events behind gets a resync instead
+MAX_PENDING = int(os.environ.get("EVENT_STREAM_MAX_PENDING", "500"))
+
+class StreamFull(Exception):
+    """Raised when a worker already serves MAX_SUBSCRIBERS streams."""
+
+# ============================================================================
+# SUBSCRIPTIONS
+# ============================================================================
+
+class Subscription:
+    """
+    One connected client.
+
+    Undelivered changes are kept per event id, so a client that reads
+    slower than changes arrive gets fewer, newer messages rather than an
+    ever-growing queue. Past MAX_PENDING events it is told to resync.
+    """
+
+    def __init__(self, event_ids: Iterable[str], party_id: Optional[str], constituency_id: Optional[str]):
+        self.event_ids = frozenset(event_ids)
+        self.party_id = party_id
+        self.constituency_id = constituency_id
+        self.pending = {}  # event id -> payload text
+        self.resync = False
+        self.closed = False
+        self.wakeup = asyncio.Event()
+
+    def keys(self) -> list:
+        """Index keys this subscription is reachable under."""
+        keys = [("event", event_id) for event_id in self.event_ids]
+        if self.party_id:
+            keys.append(("party", self.party_id))
+        if self.constituency_id:
+            keys.append(("constituency", self.constituency_id))
+        return keys or [("all", None)]
+
+    def offer(self, event_id: str, payload: str) -> str:
+        """Queue a change; returns "queued", "coalesced" or "overflow"."""
+        if self.resync:
+            return "coalesced"  # the resync supersedes it
+        outcome = "coalesced" if event_id in self.pending else "queued"
+        self.pending[event_id] = payload
+        if len(self.pending) > MAX_PENDING:
+            self.pending = {}
+            self.resync = True
+            outcome = "overflow"
+        self.wakeup.set()
+        return outcome
+
+    def take(self) -> tuple:
+        """(resync, payloads) delivered since the last take."""
+        resync, payloads = self.resync, list(self.pending.values())
+        self.resync = False
+        self.pending = {}
+        self.wakeup.clear()
+        return resync, payloads
+
+# ============================================================================
+# HUB
+# ============================================================================
+
+def _sse(event: str, data: str, message_id: Optional[int] = None) -> bytes:
+    head = f"id: {message_id}\n" if message_id is not None else ""
+    return f"{head}event: {event}\ndata: {data}\n\n".encode("utf-8")
+
+class EventStream:
+    """
+    Per-worker fan-out of event changes.
+
+    The change listener's single connection delivers notifications on its
+    thread; they are handed to the event loop, merged per event id, and
+    every INTERVAL offered to the subscriptions indexed under the event,
+    its party and its constituency.
+    """
+
+    def __init__(self, interval: float = INTERVAL):
+        self.interval = interval
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._changes = {}  # event id -> (change, payload) since the last flush
+        self._index = {}    # key -> set of subscriptions
+        self._subscriptions = set()
+        self._sequence = 0
+
+        self.notifications_total = 0
+        self.messages_total = 0
+        self.coalesced_total = 0
+        self.resyncs_total = 0
+        self.overflows_total = 0
+        self.rejected_total = 0
+
+    # ------------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------------
+
+    def on_event_changed(self, payload: Optional[str]):
+        """Change-listener callback (listener thread)."""
+        loop = self._loop
+        if loop is None:
+            return
+        if payload is None:
+            # Reconnected: whatever was sent meanwhile is lost
+            loop.call_soon_threadsafe(self._resync_all)
+            return
+        try:
+            change = json.loads(payload)
+        except ValueError:
+            return
+        loop.call_soon_threadsafe(self._ingest, change, payload)
+
+    def _ingest(self, change: dict, payload: str):
+        self.notifications_total += 1
+        if change["id"] in self._changes:
+            self.coalesced_total += 1
+        self._changes[change["id"]] = (change, payload)
+
+    def _resync_all(self):
+        self._changes = {}
+        for subscription in self._subscriptions:
+            subscription.pending = {}
+            subscription.resync = True
+            subscription.wakeup.set()
+        self.resyncs_total += len(self._subscriptions)
+
+    def flush(self):
+        """Offer the changes gathered since the last flush to subscribers."""
+        changes, self._changes = self._changes, {}
+        for event_id, (change, payload) in changes.items():
+            targets = set(self._index.get(("all", None), ()))
+            targets.update(self._index.get(("event", event_id), ()))
+            if change.get("party_id"):
+                targets.update(self._index.get(("party", change["party_id"]), ()))
+            if change.get("constituency_id"):
+                targets.update(self._index.get(("constituency", change["constituency_id"]), ()))
+
+            for subscription in targets:
+                outcome = subscription.offer(event_id, payload)
+                if outcome == "coalesced":
+                    self.coalesced_total += 1
+                elif outcome == "overflow":
+                    self.overflows_total += 1
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._task = self._loop.create_task(self._run())
+
+    async def stop(self):
+        self._loop = None
+        for subscription in list(self._subscriptions):
+            subscription.closed = True
+            subscription.wakeup.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ------------------------------------------------------------------------
+    # Subscribers
+    # ------------------------------------------------------------------------
+
+    def admit(self):
+        """Raise StreamFull if this worker can't take another stream."""
+        if len(self._subscriptions) >= MAX_SUBSCRIBERS:
+            self.rejected_total += 1
+            raise StreamFull(f"{MAX_SUBSCRIBERS} streams already open")
+
+    def subscribe(
+        self,
+        event_ids: Iterable[str] = (),
+        party_id: Optional[str] = None,
+        constituency_id: Optional[str] = None,
+    ) -> Subscription:
+        subscription = Subscription(event_ids, party_id, constituency_id)
+        self._subscriptions.add(subscription)
+        for key in subscription.keys():
+            self._index.setdefault(key, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscriptions.discard(subscription)
+        for key in subscription.keys():
+            members = self._index.get(key)
+            if members is not None:
+                members.discard(subscription)
+                if not members:
+                    del self._index[key]
+
+    async def messages(
+        self,
+        event_ids: Iterable[str] = (),
+        party_id: Optional[str] = None,
+        constituency_id: Optional[str] = None,
+        resume: bool = False,
+    ):
+        """
+        Server-sent event body for one client.
+
+        The subscription is made here rather than by the caller so it is
+        always paired with the unsubscribe in `finally`, even for clients
+        that disconnect before the body starts.
+
+        `changes` events carry a JSON array of event states; `resync` means
+        updates were lost (reconnect, or the client fell too far behind)
+        and the client should refetch what it shows.
+        """
+        subscription = self.subscribe(event_ids, party_id, constituency_id)
+        try:
+            yield f"retry: {RETRY_MS}\n\n".encode("utf-8")
+            if resume:
+                # Reconnecting EventSource (Last-Event-ID): we don't replay
+                yield _sse("resync", "{}")
+            while not subscription.closed:
+                try:
+                    await asyncio.wait_for(subscription.wakeup.wait(), HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                resync, payloads = subscription.take()
+                if resync:
+                    yield _sse("resync", "{}")
+                if payloads:
+                    self._sequence += 1
+                    self.messages_total += 1
+                    yield _sse("changes", "[" + ",".join(payloads) + "]", self._sequence)
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "subscribers": len(self._subscriptions),
+            "index_keys": len(self._index),
+            "notifications_total": self.notifications_total,
+            "messages_total": self.messages_total,
+            "coalesced_total": self.coalesced_total,
+            "resyncs_total": self.resyncs_total,
+            "overflows_total": self.overflows_total,
+            "rejected_total": self.rejected_total,
+        }
+
+hub = EventStream()
@@ -0,0 +1,408 @@
+"""
+Nepal Elections 2026 - Synthetic Data
+Election-scale parties, constituencies, venues, events, users and RSVPs via COPY
+
+CLI:
+    python synthetic.py --scale election          # 165 constituencies, 100k events, 1M users, 5M RSVPs
+    python synthetic.py --scale small --seed 7
+    python synthetic.py --drop
+
+Synthetic rows sit next to the seed data and are recognisable by id
+(PREFIX) or, for users, by phone (PHONE_PREFIX), so a rerun replaces them
+and --drop removes them. Users get the ids the API derives from their
+phone, so a load test can sign in as any of them with the test OTP.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional
+import argparse
+import hashlib
+import json
+import math
+import sys
+import time
+import uuid
+import numpy as np
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SCALES = {
+    "small":    {"parties": 4,  "constituencies": 40,  "events": 2000,   "users": 20000,   "rsvps": 100000},
+    "medium":   {"parties": 8,  "constituencies": 165, "events": 20000,  "users": 200000,  "rsvps": 1000000},
+    "election": {"parties": 14, "constituencies": 165, "events": 100000, "users": 1000000, "rsvps": 5000000},
+}
+
+PREFIX = "syn-"
+PHONE_PREFIX = "+977990"  # + 7 digits
+
+# min_lng, min_lat, max_lng, max_lat
+NEPAL_BBOX = (80.06, 26.35, 88.20, 30.45)
+
+# West to east, as the grid columns run
+PROVINCES = ("Sudurpashchim", "Karnali", "Lumbini", "Gandaki", "Bagmati", "Madhesh", "Koshi")
+
+ELECTION_DAY = datetime(2026, 3, 5, tzinfo=timezone.utc)
+CAMPAIGN_DAYS = 60
+
+EVENTS_PER_VENUE = 4
+
+EVENT_TYPES = {
+    "rally": 0.30, "meeting": 0.20, "canvassing": 0.15, "townhall": 0.12,
+    "march": 0.08, "assembly": 0.07, "conference": 0.05, "debate": 0.03,
+}
+EVENT_STATUSES = {"confirmed": 0.85, "completed": 0.05, "cancelled": 0.06, "draft": 0.04}
+RSVP_STATUSES = {"going": 0.70, "interested": 0.20, "not_going": 0.10}
+
+TAGS = (
+    "youth", "women", "farmers", "students", "workers", "health", "education",
+    "infrastructure", "tourism", "environment", "federalism", "anti-corruption",
+)
+
+# Rows encoded per COPY chunk
+CHUNK_ROWS = 50000
+
+# Tables whose user triggers are paused during a load (derived data is
+# rebuilt set-wise afterwards instead of row by row)
+TABLES = ("parties", "constituencies", "venues", "events", "event_tags", "users", "rsvps")
+VERSIONED_TABLES = ("parties", "constituencies", "venues", "events", "event_tags")
+
+# ============================================================================
+# COPY HELPERS
+# ============================================================================
+
+class _ChunkFile:
+    """
+    File-like COPY input over a generator of text chunks.
+
+    psycopg2 sends whatever read() returns, so each call hands over one
+    whole chunk regardless of the size asked for.
+    """
+
+    def __init__(self, chunks: Iterator[str]):
+        self._chunks = chunks
+
+    def read(self, size: int = -1) -> str:
+        return next(self._chunks, "")
+
+def _chunks(lines: Iterator[str]) -> Iterator[str]:
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= CHUNK_ROWS:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+def _copy(cur, table: str, columns: tuple, lines: Iterator[str]) -> int:
+    """COPY text-format lines into table; returns rows written."""
+    cur.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN",
+        _ChunkFile(_chunks(lines)),
+    )
+    return cur.rowcount
+
+def _array(values) -> str:
+    return "{" + ",".join(f'"{value}"' for value in values) + "}"
+
+def _ts(value: datetime) -> str:
+    return value.isoformat()
+
+def _weights(n: int, skew: float, rng) -> np.ndarray:
+    """Zipf-like popularity over n items, in random order."""
+    weights = 1.0 / np.arange(1, n + 1) ** skew
+    rng.shuffle(weights)
+    return weights / weights.sum()
+
+def _pick(options: dict, n: int, rng) -> np.ndarray:
+    names = list(options)
+    return np.array(names)[rng.choice(len(names), n, p=list(options.values()))]
+
+def user_id(phone: str) -> str:
+    """Same derivation as the API's generate_user_id."""
+    return hashlib.sha256(phone.encode()).hexdigest()[:16]
+
+def phone(index: int) -> str:
+    return f"{PHONE_PREFIX}{index:07d}"
+
+# ============================================================================
+# GENERATORS
+# ============================================================================
+
+def _parties(cur, count: int, rng) -> tuple:
+    """Existing parties plus `count` synthetic ones -> (ids, popularity)."""
+    cur.execute(f"SELECT id FROM parties WHERE id NOT LIKE '{PREFIX}%' ORDER BY id")
+    ids = [row["id"] for row in cur.fetchall()]
+    synthetic = [f"{PREFIX}p{i:02d}" for i in range(1, count + 1)]
+
+    lines = (
+        f"{party_id}\tSynthetic Party {i}\tSYN{i}\t#{rng.integers(0, 1 << 24):06x}\n"
+        for i, party_id in enumerate(synthetic, 1)
+    )
+    _copy(cur, "parties", ("id", "name", "short_name", "color"), lines)
+
+    ids += synthetic
+    return ids, _weights(len(ids), 1.0, rng)
+
+def _constituencies(cur, count: int, rng) -> tuple:
+    """A grid of rectangles over Nepal -> (ids, cells [min_lng, min_lat, max_lng, max_lat], popularity)."""
+    min_lng, min_lat, max_lng, max_lat = NEPAL_BBOX
+    cols = math.ceil(math.sqrt(count * 2))  # the country is about twice as wide as tall
+    rows = math.ceil(count / cols)
+    width, height = (max_lng - min_lng) / cols, (max_lat - min_lat) / rows
+
+    ids, cells, lines = [], [], []
+    for i in range(count):
+        col, row = i % cols, i // cols
+        x0, y0 = min_lng + col * width, min_lat + row * height
+        x1, y1 = x0 + width, y0 + height
+        province = PROVINCES[col * len(PROVINCES) // cols]
+        constituency_id = f"{PREFIX}c{i + 1:03d}"
+        polygon = f"POLYGON(({x0} {y0},{x1} {y0},{x1} {y1},{x0} {y1},{x0} {y0}))"
+        lines.append(
+            f"{constituency_id}\tSynthetic-{i + 1}\t{province}\t{province} District {row + 1}\t"
+            f"{int(rng.integers(60000, 130000))}\t"
+            f"SRID=4326;POINT({(x0 + x1) / 2} {(y0 + y1) / 2})\tSRID=4326;{polygon}\n"
+        )
+        ids.append(constituency_id)
+        cells.append((x0, y0, x1, y1))
+
+    _copy(cur, "constituencies",
+          ("id", "name", "province", "district", "registered_voters", "center", "bounds"), iter(lines))
+    return ids, np.array(cells), _weights(count, 0.9, rng)
+
+def _venues(cur, count: int, constituency_ids: list, cells: np.ndarray, popularity: np.ndarray, rng) -> tuple:
+    """Venues spread by constituency popularity -> (ids, constituency index per venue), sorted by constituency."""
+    n = len(constituency_ids)
+    # Every constituency gets at least one venue
+    owner = np.concatenate([np.arange(n), rng.choice(n, max(count - n, 0), p=popularity)])
+    owner.sort()
+    x0, y0, x1, y1 = cells[owner].T
+    lng = x0 + rng.random(len(owner)) * (x1 - x0)
+    lat = y0 + rng.random(len(owner)) * (y1 - y0)
+    ids = [str(uuid.UUID(bytes=rng.bytes(16), version=4)) for _ in range(len(owner))]
+
+    lines = (
+        f"{ids[i]}\tSynthetic Venue {i + 1}\tWard {i % 32 + 1}, Synthetic-{owner[i] + 1}\t"
+        f"SRID=4326;POINT({lng[i]:.6f} {lat[i]:.6f})\t{constituency_ids[owner[i]]}\t{int(rng.integers(200, 20000))}\n"
+        for i in range(len(owner))
+    )
+    _copy(cur, "venues", ("id", "name", "address", "location", "constituency_id", "capacity"), lines)
+    return ids, owner
+
+def _events(
+    cur, count: int, party_ids: list, party_popularity: np.ndarray,
+    constituency_ids: list, constituency_popularity: np.ndarray,
+    venue_ids: list, venue_owner: np.ndarray, rng,
+) -> list:
+    """Events at venues in popular constituencies -> ids."""
+    constituency = rng.choice(len(constituency_ids), count, p=constituency_popularity)
+    # venue_owner is sorted, so each constituency's venues are one contiguous range
+    first = np.searchsorted(venue_owner, constituency, side="left")
+    last = np.searchsorted(venue_owner, constituency, side="right")
+    venue = first + (rng.random(count) * (last - first)).astype(int)
+
+    party = rng.choice(len(party_ids), count, p=party_popularity)
+    types = _pick(EVENT_TYPES, count, rng)
+    statuses = _pick(EVENT_STATUSES, count, rng)
+    # Campaign days, 07:00-18:00 Nepal time (UTC+5:45), on quarter hours
+    start_minutes = rng.integers(0, CAMPAIGN_DAYS, count) * 1440 + rng.integers(28, 73, count) * 15 - 345
+    durations = rng.integers(4, 17, count) * 15
+    attendance = np.minimum(rng.lognormal(6.0, 1.0, count), 200000).astype(int)
+    campaign_start = ELECTION_DAY - timedelta(days=CAMPAIGN_DAYS)
+
+    ids = [f"{PREFIX}e{i + 1:06d}" for i in range(count)]
+
+    def lines():
+        for i in range(count):
+            starts = campaign_start + timedelta(minutes=int(start_minutes[i]))
+            speakers = [f"Speaker {n}" for n in rng.choice(2000, rng.integers(1, 4), replace=False)]
+            yield (
+                f"{ids[i]}\t{party_ids[party[i]]} {types[i]} in Synthetic-{constituency[i] + 1} #{i + 1}\t"
+                f"{party_ids[party[i]]}\t{constituency_ids[constituency[i]]}\t{venue_ids[venue[i]]}\t"
+                f"{types[i]}\t{statuses[i]}\tSynthetic {types[i]} for load testing.\t"
+                f"{_ts(starts)}\t{_ts(starts + timedelta(minutes=int(durations[i])))}\t"
+                f"{_array(speakers)}\t{attendance[i]}\n"
+            )
+
+    _copy(cur, "events", (
+        "id", "title", "party_id", "constituency_id", "venue_id", "event_type", "status",
+        "description", "datetime", "end_time", "speakers", "expected_attendance",
+    ), lines())
+
+    def tag_lines():
+        for i in range(count):
+            for tag in rng.choice(TAGS, rng.integers(0, 4), replace=False):
+                yield f"{ids[i]}\t{tag}\n"
+
+    _copy(cur, "event_tags", ("event_id", "tag"), tag_lines())
+    return ids
+
+def _users(cur, count: int, constituency_ids: list, popularity: np.ndarray, rng) -> list:
+    """Citizens with API-compatible ids -> ids."""
+    constituency = rng.choice(len(constituency_ids), count, p=popularity)
+    ids = [user_id(phone(i)) for i in range(count)]
+    lines = (
+        f"{ids[i]}\t{phone(i)}\tVoter {i + 1}\tcitizen\t{constituency_ids[constituency[i]]}\n"
+        for i in range(count)
+    )
+    _copy(cur, "users", ("id", "phone", "name", "role", "constituency_id"), lines)
+    return ids
+
+def _rsvps(cur, count: int, user_ids: list, event_ids: list, rng) -> int:
+    """
+    About `count` RSVPs; per-user counts are geometric and events are
+    picked by a steep popularity curve, so a few events are very hot.
+    """
+    popularity = _weights(len(event_ids), 1.1, rng)
+    mean = max(count / len(user_ids), 1.0)
+    campaign_start = ELECTION_DAY - timedelta(days=CAMPAIGN_DAYS)
+    statuses = list(RSVP_STATUSES)
+    block = 100000
+    total = 0
+
+    def lines():
+        nonlocal total
+        for start in range(0, len(user_ids), block):
+            users = np.arange(start, min(start + block, len(user_ids)))
+            per_user = rng.geometric(1.0 / mean, len(users))
+            user = np.repeat(users, per_user)
+            event = rng.choice(len(event_ids), len(user), p=popularity)
+            # One RSVP per (user, event)
+            pairs = np.unique(user.astype(np.int64) * len(event_ids) + event)
+            user, event = pairs // len(event_ids), pairs % len(event_ids)
+            status = rng.choice(len(statuses), len(pairs), p=list(RSVP_STATUSES.values()))
+            minutes = rng.integers(0, CAMPAIGN_DAYS * 1440, len(pairs))
+            total += len(pairs)
+            for i in range(len(pairs)):
+                created = campaign_start + timedelta(minutes=int(minutes[i]))
+                yield f"{user_ids[user[i]]}\t{event_ids[event[i]]}\t{statuses[status[i]]}\t{_ts(created)}\n"
+
+    _copy(cur, "rsvps", ("user_id", "event_id", "status", "created_at"), lines())
+    return total
+
+# ============================================================================
+# LOAD
+# ============================================================================
+
+def _pause_triggers(cur, paused: bool):
+    """Per-row triggers off for the load; FK checks (system triggers) stay on."""
+    action = "DISABLE" if paused else "ENABLE"
+    for table in TABLES:
+        cur.execute(f"ALTER TABLE {table} {action} TRIGGER USER")
+
+def _drop(cur) -> dict:
+    """Delete synthetic rows (dependent rows go by cascade)."""
+    removed = {}
+    for table, condition in (
+        ("events_read", f"id LIKE '{PREFIX}%'"),
+        ("events", f"id LIKE '{PREFIX}%'"),
+        ("users", f"phone LIKE '{PHONE_PREFIX}%'"),
+        ("venues", f"constituency_id LIKE '{PREFIX}%'"),
+        ("constituencies", f"id LIKE '{PREFIX}%'"),
+        ("parties", f"id LIKE '{PREFIX}%'"),
+    ):
+        cur.execute(f"DELETE FROM {table} WHERE {condition}")
+        removed[table] = cur.rowcount
+    return removed
+
+def _rebuild_derived(cur, event_ids: list):
+    """What the paused triggers would have done, set-wise."""
+    cur.execute("SELECT refresh_constituency_boundaries()")
+    cur.execute("SELECT recount_event_rsvps()")
+    cur.execute("SELECT rebuild_event_stats()")
+    if event_ids:
+        cur.execute("SELECT bulk_refresh_events(%s)", (event_ids,))
+    # Bumps versions and tells every API worker to drop its caches
+    for table in VERSIONED_TABLES:
+        cur.execute("SELECT bump_table_version(%s)", (table,))
+    cur.execute("SELECT pg_notify('table_changed', 'users')")
+
+def generate(cur, scale: dict, seed: int = 2026) -> dict:
+    """Replace the synthetic data set; returns row counts and timings."""
+    rng = np.random.default_rng(seed)
+    report = {"seed": seed, "rows": {}, "seconds": {}}
+
+    def step(name: str, fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        report["seconds"][name] = round(time.perf_counter() - started, 2)
+        return result
+
+    _pause_triggers(cur, True)
+    report["removed"] = step("drop", _drop, cur)
+
+    party_ids, party_popularity = step("parties", _parties, cur, scale["parties"], rng)
+    constituency_ids, cells, popularity = step("constituencies", _constituencies, cur, scale["constituencies"], rng)
+    venue_ids, venue_owner = step(
+        "venues", _venues, cur, max(scale["events"] // EVENTS_PER_VENUE, 1), constituency_ids, cells, popularity, rng
+    )
+    event_ids = step(
+        "events", _events, cur, scale["events"], party_ids, party_popularity,
+        constituency_ids, popularity, venue_ids, venue_owner, rng,
+    )
+    user_ids = step("users", _users, cur, scale["users"], constituency_ids, popularity, rng)
+    rsvps = step("rsvps", _rsvps, cur, scale["rsvps"], user_ids, event_ids, rng)
+
+    step("derived", _rebuild_derived, cur, event_ids)
+    _pause_triggers(cur, False)
+
+    report["rows"] = {
+        "parties": scale["parties"],
+        "constituencies": len(constituency_ids),
+        "venues": len(venue_ids),
+        "events": len(event_ids),
+        "users": len(user_ids),
+        "rsvps": rsvps,
+    }
+    return report
+
+def drop(cur) -> dict:
+    _pause_triggers(cur, True)
+    removed = _drop(cur)
+    _rebuild_derived(cur, [])
+    _pause_triggers(cur, False)
+    return {"removed": removed}
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main(argv: Optional[list] = None) -> int:
+    import db
+
+    parser = argparse.ArgumentParser(description="Load (or remove) a synthetic election-scale data set")
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--seed", type=int, default=2026, help="Same seed, same data")
+    parser.add_argument("--events", type=int, help="Override the scale's event count")
+    parser.add_argument("--users", type=int, help="Override the scale's user count")
+    parser.add_argument("--rsvps", type=int, help="Override the scale's RSVP count")
+    parser.add_argument("--drop", action="store_true", help="Remove synthetic data and exit")
+    args = parser.parse_args(argv)
+
+    scale = dict(SCALES[args.scale])
+    for name in ("events", "users", "rsvps"):
+        if getattr(args, name):
+            scale[name] = getattr(args, name)
+
+    # One transaction: a failed load leaves the database as it was
+    with db.get_db() as conn:
+        cur = conn.cursor()
+        report = drop(cur) if args.drop else generate(cur, scale, args.seed)
+
+    # Fresh statistics for the planner (outside the load transaction)
+    conn = db.get_db_connection()
+    try:
+        conn.autocommit = True
+        for table in TABLES + ("events_read", "event_search"):
+            conn.cursor().execute(f"ANALYZE {table}")
+    finally:
+        conn.close()
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Nepal Elections 2026 - Conditional Requests
+Table version registry (sql/010) and ETag / Last-Modified / 304 handling
+"""
+
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional
+import hashlib
+import re
+import threading
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+import db
+
+# ============================================================================
+# VERSION REGISTRY
+# ============================================================================
+
+class VersionRegistry:
+    """
+    In-process copy of table_versions.
+
+    Entries are dropped by change notifications, so while the listener is
+    connected a version lookup is a dict read. Without a live listener the
+    versions are re-read on every request rather than trusted.
+
+    Each load also records the primary's WAL position, which a replica must
+    have replayed before it may serve a response validated by these
+    versions.
+    """
+
+    def __init__(self, is_live: Callable[[], bool]):
+        self._is_live = is_live
+        self._lock = threading.Lock()
+        self._versions = {}  # table -> (version, changed_at)
+        self._lsn = None     # primary WAL position when _versions was read
+        self.loads_total = 0
+
+    def _load(self):
+        with db.get_db() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT table_name, version, changed_at, pg_current_wal_lsn() - '0/0'::pg_lsn AS lsn
+                FROM table_versions
+            """)
+            rows = cur.fetchall()
+        versions = {row["table_name"]: (row["version"], row["changed_at"]) for row in rows}
+        lsn = int(rows[0]["lsn"]) if rows else None
+        with self._lock:
+            # Position first: a reader takes versions then position, so it
+            # may pair old versions with a newer position, never the reverse
+            self._lsn = lsn
+            self._versions = versions
+            self.loads_total += 1
+        return versions, lsn
+
+    def get(self, tables: tuple) -> tuple:
+        """(versions, last changed_at, WAL position) for the tables (blocking)."""
+        versions = self._versions
+        lsn = self._lsn
+        if not self._is_live() or any(table not in versions for table in tables):
+            versions, lsn = self._load()
+        entries = [versions.get(table, (0, None)) for table in tables]
+        changed = [changed_at for _, changed_at in entries if changed_at is not None]
+        return tuple(version for version, _ in entries), max(changed) if changed else None, lsn
+
+    def on_table_changed(self, table: Optional[str]):
+        """Change-listener callback."""
+        with self._lock:
+            if table is None:
+                self._versions = {}
+            else:
+                self._versions = {k: v for k, v in self._versions.items() if k != table}
+
+    def stats(self) -> dict:
+        return {
+            "tables": {table: version for table, (version, _) in self._versions.items()},
+            "loads_total": self.loads_total,
+        }
+
+# ============================================================================
+# ROUTE POLICIES
+# ============================================================================
+
+class CachePolicy:
+    """
+    Validators and Cache-Control for one route.
+
+    `tables` are the versioned tables the response is derived from. With
+    `per_user`, signed-in requests also fold in a fingerprint of the user's
+    RSVPs and are marked private. `extra()` adds anything else the response
+    depends on (such as the current date) to the ETag; such responses carry
+    no Last-Modified.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        tables: tuple,
+        cache_control: str,
+        per_user: bool = False,
+        extra: Optional[Callable[[], Any]] = None,
+    ):
+        self.pattern = re.compile(path)
+        self.tables = tables
+        self.cache_control = cache_control
+        self.per_user = per_user
+        self.extra = extra
+
+def _http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+def _not_modified_since(header: Optional[str], last_modified: Optional[datetime]) -> bool:
+    if not header or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return last_modified.replace(microsecond=0) <= since
+
+class ConditionalMiddleware:
+    """
+    Pure ASGI middleware answering If-None-Match / If-Modified-Since with
+    304 before the endpoint runs, and stamping ETag, Last-Modified and
+    Cache-Control on 200 responses of the routes it has a policy for.
+    """
+
+    def __init__(
+        self,
+        app,
+        registry: VersionRegistry,
+        policies: list,
+        user_fingerprint: Callable[[Headers], Awaitable[Optional[str]]],
+    ):
+        self.app = app
+        self.registry = registry
+        self.policies = policies
+        self.user_fingerprint = user_fingerprint
+        self.not_modified_total = 0
+
+    def _policy(self, path: str) -> Optional[CachePolicy]:
+        for policy in self.policies:
+            if policy.pattern.search(path):
+                return policy
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            return await self.app(scope, receive, send)
+        policy = self._policy(scope["path"])
+        if policy is None:
+            return await self.app(scope, receive, send)
+
+        request_headers = Headers(scope=scope)
+        try:
+            versions, last_modified, lsn = await run_in_threadpool(self.registry.get, policy.tables)
+            user_part = await self.user_fingerprint(request_headers) if policy.per_user else None
+            extra_part = policy.extra() if policy.extra is not None else None
+        except Exception:
+            # No validators beat no response; let the endpoint report DB errors
+            return await self.app(scope, receive, send)
+
+        digest = hashlib.sha1(repr((
+            scope["path"], scope.get("query_string", b""), versions, user_part, extra_part
+        )).encode()).hexdigest()[:20]
+        etag = f'W/"{digest}"'
+
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "private, no-cache" if user_part else policy.cache_control,
+            "Vary": "Authorization",
+        }
+        if extra_part is not None:
+            last_modified = None  # the tables' change time does not cover it
+        if last_modified is not None and not user_part:
+            headers["Last-Modified"] = _http_date(last_modified)
+
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            fresh = etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+        else:
+            fresh = not user_part and _not_modified_since(
+                request_headers.get("if-modified-since"), last_modified
+            )
+
+        if fresh:
+            self.not_modified_total += 1
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_validators(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                response_headers = MutableHeaders(scope=message)
+                for name, value in headers.items():
+                    if name == "Vary" and "vary" in response_headers:
+                        response_headers.add_vary_header(value)
+                    elif name.lower() not in response_headers:
+                        response_headers[name] = value
+            await send(message)
+
+        # A replica read must be at least as new as the versions in the ETag
+        with db.replayed_at_least(lsn):
+            await self.app(scope, receive, send_with_validators)
@@ -9,6 +9,14 @@ UPDATE events SET rsvp_count = 0;
 -- Clear any stale RSVP records (if re-seeding)
 TRUNCATE rsvps RESTART IDENTITY CASCADE;
 
+-- Clear pending counter deltas (table exists once 008_rsvp_counters.sql ran)
+DO $$
+BEGIN
+  IF to_regclass('rsvp_count_deltas') IS NOT NULL THEN
+    TRUNCATE rsvp_count_deltas;
+  END IF;
+END $$;
+
 -- Verify
 SELECT 'Events reset:' as status, COUNT(*) as count FROM events WHERE rsvp_count = 0;
 SELECT 'RSVPs cleared:' as status, COUNT(*) as count FROM rsvps;
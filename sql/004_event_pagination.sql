@@ -0,0 +1,18 @@
+-- ============================================================================
+-- Nepal Elections 2026 - Keyset Pagination Indexes
+-- Run after 001_schema.sql
+--
+-- Event lists page by (sort column, id) instead of OFFSET. These indexes
+-- serve both sort orders (Postgres scans them backwards for DESC).
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_events_datetime_id ON events(datetime, id);
+CREATE INDEX IF NOT EXISTS idx_events_rsvp_count_id ON events(rsvp_count, id);
+
+-- Party and constituency event lists always sort by datetime
+CREATE INDEX IF NOT EXISTS idx_events_party_datetime_id ON events(party_id, datetime, id);
+CREATE INDEX IF NOT EXISTS idx_events_constituency_datetime_id ON events(constituency_id, datetime, id);
+
+-- ============================================================================
+-- KEYSET INDEXES COMPLETE
+-- ============================================================================
@@ -0,0 +1,86 @@
+-- ============================================================================
+-- Nepal Elections 2026 - Event Search Index
+-- Run after 001_schema.sql
+--
+-- Maintains one search row per event with:
+--   document     tsvector over title (EN + NE), venue, speakers, description
+--   search_text  lower-cased names for trigram (typo-tolerant) matching
+-- ============================================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+DROP TABLE IF EXISTS event_search CASCADE;
+
+CREATE TABLE event_search (
+  event_id VARCHAR(50) PRIMARY KEY REFERENCES events(id) ON DELETE CASCADE,
+  document TSVECTOR NOT NULL,
+  search_text TEXT NOT NULL
+);
+
+CREATE INDEX idx_event_search_document ON event_search USING GIN(document);
+CREATE INDEX idx_event_search_text_trgm ON event_search USING GIN(search_text gin_trgm_ops);
+
+-- ============================================================================
+-- FUNCTIONS & TRIGGERS
+-- ============================================================================
+
+-- Rebuild the search rows for the given events. English text is indexed with
+-- both the 'english' (stemmed) and 'simple' configs; Nepali text, venue names
+-- and speaker names use 'simple' only since Postgres has no Nepali stemmer.
+CREATE OR REPLACE FUNCTION refresh_event_search(p_event_ids VARCHAR(50)[])
+RETURNS VOID AS $$
+BEGIN
+  INSERT INTO event_search (event_id, document, search_text)
+  SELECT
+    e.id,
+    setweight(to_tsvector('english', coalesce(e.title, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(e.title, '') || ' ' || coalesce(e.title_nepali, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(v.name, '') || ' ' || coalesce(v.name_nepali, '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce(array_to_string(e.speakers, ' '), '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(e.description, '')), 'C'),
+    lower(concat_ws(' ', e.title, e.title_nepali, v.name, v.name_nepali,
+                    array_to_string(e.speakers, ' ')))
+  FROM events e
+  LEFT JOIN venues v ON e.venue_id = v.id
+  WHERE e.id = ANY(p_event_ids)
+  ON CONFLICT (event_id) DO UPDATE
+    SET document = EXCLUDED.document,
+        search_text = EXCLUDED.search_text;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION event_search_on_event_change()
+RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM refresh_event_search(ARRAY[NEW.id]);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION event_search_on_venue_change()
+RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM refresh_event_search(ARRAY(SELECT id FROM events WHERE venue_id = NEW.id));
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS refresh_event_search_on_event ON events;
+CREATE TRIGGER refresh_event_search_on_event
+  AFTER INSERT OR UPDATE OF title, title_nepali, description, speakers, venue_id ON events
+  FOR EACH ROW EXECUTE FUNCTION event_search_on_event_change();
+
+DROP TRIGGER IF EXISTS refresh_event_search_on_venue ON venues;
+CREATE TRIGGER refresh_event_search_on_venue
+  AFTER UPDATE OF name, name_nepali ON venues
+  FOR EACH ROW EXECUTE FUNCTION event_search_on_venue_change();
+
+-- ============================================================================
+-- BACKFILL
+-- ============================================================================
+
+SELECT refresh_event_search(ARRAY(SELECT id FROM events));
+
+-- ============================================================================
+-- SEARCH INDEX COMPLETE
+-- ============================================================================
@@ -0,0 +1,40 @@
+-- ============================================================================
+-- Nepal Elections 2026 - Change Notifications
+-- Run after 001_schema.sql
+--
+-- Every write to a table with an updated_at trigger sends
+--   NOTIFY table_changed, '<table name>'
+-- so each API worker can invalidate its in-process caches. Notifications
+-- are delivered on commit and de-duplicated within a transaction.
+-- ============================================================================
+
+-- The existing update_*_updated_at triggers now also announce the change
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+  NEW.updated_at = NOW();
+  PERFORM pg_notify('table_changed', TG_TABLE_NAME);
+  RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+-- Inserts and deletes don't touch updated_at, so announce them separately
+CREATE OR REPLACE FUNCTION notify_table_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM pg_notify('table_changed', TG_TABLE_NAME);
+  RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS notify_parties_changed ON parties;
+CREATE TRIGGER notify_parties_changed AFTER INSERT OR DELETE OR TRUNCATE ON parties
+  FOR EACH STATEMENT EXECUTE FUNCTION notify_table_changed();
+
+DROP TRIGGER IF EXISTS notify_constituencies_changed ON constituencies;
+CREATE TRIGGER notify_constituencies_changed AFTER INSERT OR DELETE OR TRUNCATE ON constituencies
+  FOR EACH STATEMENT EXECUTE FUNCTION notify_table_changed();
+
+-- ============================================================================
+-- CHANGE NOTIFICATIONS COMPLETE
+-- ============================================================================
@@ -0,0 +1,161 @@
+-- ============================================================================
+-- Nepal Elections 2026 - Event Read Model
+-- Run after 001_schema.sql
+--
+-- events_read is a trigger-maintained, denormalized copy of the events_full
+-- view: the party/constituency/venue columns, lat/lng and tags array are
+-- computed once per write instead of once per read. The view stays the
+-- single definition of the row shape; refresh_events_read() copies from it.
+-- ============================================================================
+
+DROP TABLE IF EXISTS events_read CASCADE;
+
+CREATE TABLE events_read AS
+SELECT f.*, v.location AS venue_location
+FROM events_full f
+LEFT JOIN venues v ON f.venue_id = v.id
+WITH NO DATA;
+
+ALTER TABLE events_read ADD PRIMARY KEY (id);
+
+-- Matches the list filters: status is always set by list_events, party and
+-- constituency lists sort by datetime, and every keyset order ends in id
+CREATE INDEX idx_events_read_status_datetime ON events_read(status, datetime, id);
+CREATE INDEX idx_events_read_status_rsvp_count ON events_read(status, rsvp_count, id);
+CREATE INDEX idx_events_read_datetime ON events_read(datetime, id);
+CREATE INDEX idx_events_read_party_datetime ON events_read(party_id, datetime, id);
+CREATE INDEX idx_events_read_constituency_datetime ON events_read(constituency_id, datetime, id);
+CREATE INDEX idx_events_read_type_datetime ON events_read(event_type, datetime, id);
+CREATE INDEX idx_events_read_location ON events_read USING GIST(venue_location);
+
+-- The keyset indexes from 004 served reads on events; reads moved here
+DROP INDEX IF EXISTS idx_events_datetime_id;
+DROP INDEX IF EXISTS idx_events_rsvp_count_id;
+DROP INDEX IF EXISTS idx_events_party_datetime_id;
+DROP INDEX IF EXISTS idx_events_constituency_datetime_id;
+
+-- ============================================================================
+-- FUNCTIONS
+-- ============================================================================
+
+-- Recompute the read rows for the given events (removes deleted ones)
+CREATE OR REPLACE FUNCTION refresh_events_read(p_event_ids VARCHAR(50)[])
+RETURNS VOID AS $$
+BEGIN
+  DELETE FROM events_read WHERE id = ANY(p_event_ids);
+  INSERT INTO events_read
+  SELECT f.*, v.location
+  FROM events_full f
+  LEFT JOIN venues v ON f.venue_id = v.id
+  WHERE f.id = ANY(p_event_ids);
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION events_read_on_event_change()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    DELETE FROM events_read WHERE id = OLD.id;
+  ELSIF TG_OP = 'UPDATE'
+        AND (to_jsonb(NEW) - 'rsvp_count' - 'updated_at') = (to_jsonb(OLD) - 'rsvp_count' - 'updated_at') THEN
+    -- RSVP counter bumps are by far the most common write; skip the joins
+    UPDATE events_read
+    SET rsvp_count = NEW.rsvp_count, updated_at = NEW.updated_at
+    WHERE id = NEW.id;
+  ELSE
+    PERFORM refresh_events_read(ARRAY[NEW.id]);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION events_read_on_tag_change()
+RETURNS TRIGGER AS $$
+DECLARE
+  v_event_id VARCHAR(50);
+BEGIN
+  FOREACH v_event_id IN ARRAY ARRAY[
+    CASE WHEN TG_OP <> 'INSERT' THEN OLD.event_id END,
+    CASE WHEN TG_OP <> 'DELETE' THEN NEW.event_id END
+  ] LOOP
+    IF v_event_id IS NOT NULL THEN
+      UPDATE events_read
+      SET tags = ARRAY(SELECT tag FROM event_tags WHERE event_id = v_event_id)
+      WHERE id = v_event_id;
+    END IF;
+  END LOOP;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION events_read_on_venue_change()
+RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM refresh_events_read(ARRAY(SELECT id FROM events WHERE venue_id = NEW.id));
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION events_read_on_party_change()
+RETURNS TRIGGER AS $$
+BEGIN
+  UPDATE events_read
+  SET party_name = NEW.name,
+      party_short_name = NEW.short_name,
+      party_color = NEW.color
+  WHERE party_id = NEW.id;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION events_read_on_constituency_change()
+RETURNS TRIGGER AS $$
+BEGIN
+  UPDATE events_read
+  SET constituency_name = NEW.name,
+      province = NEW.province,
+      district = NEW.district
+  WHERE constituency_id = NEW.id;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- TRIGGERS
+-- ============================================================================
+
+DROP TRIGGER IF EXISTS refresh_events_read_on_event ON events;
+CREATE TRIGGER refresh_events_read_on_event
+  AFTER INSERT OR UPDATE OR DELETE ON events
+  FOR EACH ROW EXECUTE FUNCTION events_read_on_event_change();
+
+DROP TRIGGER IF EXISTS refresh_events_read_on_tag ON event_tags;
+CREATE TRIGGER refresh_events_read_on_tag
+  AFTER INSERT OR UPDATE OR DELETE ON event_tags
+  FOR EACH ROW EXECUTE FUNCTION events_read_on_tag_change();
+
+DROP TRIGGER IF EXISTS refresh_events_read_on_venue ON venues;
+CREATE TRIGGER refresh_events_read_on_venue
+  AFTER UPDATE OF name, address, location ON venues
+  FOR EACH ROW EXECUTE FUNCTION events_read_on_venue_change();
+
+DROP TRIGGER IF EXISTS refresh_events_read_on_party ON parties;
+CREATE TRIGGER refresh_events_read_on_party
+  AFTER UPDATE OF name, short_name, color ON parties
+  FOR EACH ROW EXECUTE FUNCTION events_read_on_party_change();
+
+DROP TRIGGER IF EXISTS refresh_events_read_on_constituency ON constituencies;
+CREATE TRIGGER refresh_events_read_on_constituency
+  AFTER UPDATE OF name, province, district ON constituencies
+  FOR EACH ROW EXECUTE FUNCTION events_read_on_constituency_change();
+
+-- ============================================================================
+-- BACKFILL
+-- ============================================================================
+
+SELECT refresh_events_read(ARRAY(SELECT id FROM events));
+ANALYZE events_read;
+
+-- ============================================================================
+-- READ MODEL COMPLETE
+-- ============================================================================
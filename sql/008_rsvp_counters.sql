@@ -0,0 +1,118 @@
+-- ============================================================================
+-- Nepal Elections 2026 - Contention-Free RSVP Counters
+-- Run after 001_schema.sql
+--
+-- RSVP writes no longer UPDATE the event row. The rsvps trigger appends a
+-- +1/-1 row to rsvp_count_deltas (insert-only, so concurrent RSVPs for one
+-- hot event never wait on each other), and fold_rsvp_count_deltas() folds
+-- the log into events.rsvp_count in one batched UPDATE. The API calls it
+-- every RSVP_FOLD_INTERVAL seconds, which bounds list staleness; single
+-- event reads add the pending deltas and are exact.
+--
+-- rsvp_count counts 'going' RSVPs. Status changes between going,
+-- interested and not_going now move the count accordingly.
+-- ============================================================================
+
+DROP TABLE IF EXISTS rsvp_count_deltas CASCADE;
+
+CREATE TABLE rsvp_count_deltas (
+  id BIGSERIAL PRIMARY KEY,
+  event_id VARCHAR(50) NOT NULL,
+  delta INTEGER NOT NULL,
+  created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX idx_rsvp_count_deltas_event ON rsvp_count_deltas(event_id);
+
+-- ============================================================================
+-- FUNCTIONS & TRIGGERS
+-- ============================================================================
+
+-- How much one RSVP in a given status contributes to rsvp_count
+CREATE OR REPLACE FUNCTION rsvp_count_weight(p_status VARCHAR)
+RETURNS INTEGER AS $$
+  SELECT CASE WHEN p_status = 'going' THEN 1 ELSE 0 END;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION update_event_rsvp_count()
+RETURNS TRIGGER AS $$
+DECLARE
+  v_delta INTEGER;
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    v_delta := rsvp_count_weight(NEW.status);
+  ELSIF TG_OP = 'DELETE' THEN
+    v_delta := -rsvp_count_weight(OLD.status);
+  ELSE
+    -- Same user, same event; only the status can change
+    v_delta := rsvp_count_weight(NEW.status) - rsvp_count_weight(OLD.status);
+  END IF;
+
+  IF v_delta <> 0 THEN
+    INSERT INTO rsvp_count_deltas (event_id, delta)
+    VALUES (COALESCE(NEW.event_id, OLD.event_id), v_delta);
+  END IF;
+  RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- Fold pending deltas into events.rsvp_count. Returns the number of events
+-- updated, or -1 if another session is already folding. Deltas inserted
+-- after the DELETE's snapshot are left for the next fold.
+CREATE OR REPLACE FUNCTION fold_rsvp_count_deltas()
+RETURNS INTEGER AS $$
+DECLARE
+  v_events INTEGER;
+BEGIN
+  IF NOT pg_try_advisory_xact_lock(hashtext('fold_rsvp_count_deltas')) THEN
+    RETURN -1;
+  END IF;
+
+  WITH folded AS (
+    DELETE FROM rsvp_count_deltas
+    RETURNING event_id, delta
+  ), sums AS (
+    SELECT event_id, SUM(delta) AS delta
+    FROM folded
+    GROUP BY event_id
+  )
+  UPDATE events e
+  SET rsvp_count = e.rsvp_count + s.delta
+  FROM sums s
+  WHERE e.id = s.event_id AND s.delta <> 0;
+
+  GET DIAGNOSTICS v_events = ROW_COUNT;
+  RETURN v_events;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Rebuild every count from the rsvps table (repair / migration)
+CREATE OR REPLACE FUNCTION recount_event_rsvps()
+RETURNS VOID AS $$
+BEGIN
+  PERFORM pg_advisory_xact_lock(hashtext('fold_rsvp_count_deltas'));
+  DELETE FROM rsvp_count_deltas;
+  UPDATE events e
+  SET rsvp_count = c.going
+  FROM (
+    SELECT e2.id, COALESCE(SUM(rsvp_count_weight(r.status)), 0) AS going
+    FROM events e2
+    LEFT JOIN rsvps r ON r.event_id = e2.id
+    GROUP BY e2.id
+  ) c
+  WHERE e.id = c.id AND e.rsvp_count IS DISTINCT FROM c.going;
+END;
+$$ LANGUAGE plpgsql;
+
+-- update_rsvp_count (from 001) keeps firing; only its function changed.
+
+-- ============================================================================
+-- BACKFILL
+-- ============================================================================
+
+-- Counts previously included interested/not_going RSVPs
+SELECT recount_event_rsvps();
+
+-- ============================================================================
+-- RSVP COUNTERS COMPLETE
+-- ============================================================================
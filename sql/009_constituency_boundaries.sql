@@ -0,0 +1,109 @@
+-- ============================================================================
+-- Nepal Elections 2026 - Constituency Boundaries
+-- Run after 001_schema.sql
+--
+-- Precomputed boundary data so the API never parses full polygons:
+--   constituency_extents     true bbox per constituency (ST_Extent)
+--   constituency_shapes      GeoJSON simplified at each shape level
+--   constituency_shape_levels  tolerance per level and the zoom it serves
+-- The whole coverage is simplified together (ST_CoverageSimplify) so that
+-- neighbouring constituencies keep identical shared edges.
+-- ============================================================================
+
+DROP TABLE IF EXISTS constituency_shape_levels CASCADE;
+DROP TABLE IF EXISTS constituency_extents CASCADE;
+DROP TABLE IF EXISTS constituency_shapes CASCADE;
+
+CREATE TABLE constituency_shape_levels (
+  level SMALLINT PRIMARY KEY,
+  tolerance DOUBLE PRECISION NOT NULL,  -- degrees
+  min_zoom SMALLINT NOT NULL            -- served from this map zoom up
+);
+
+INSERT INTO constituency_shape_levels (level, tolerance, min_zoom) VALUES
+  (0, 0.01,   0),   -- ~1 km: country and province views
+  (1, 0.003,  8),
+  (2, 0.001,  10),
+  (3, 0.0002, 12);  -- street level
+
+CREATE TABLE constituency_extents (
+  constituency_id VARCHAR(50) PRIMARY KEY REFERENCES constituencies(id) ON DELETE CASCADE,
+  min_lng DOUBLE PRECISION NOT NULL,
+  min_lat DOUBLE PRECISION NOT NULL,
+  max_lng DOUBLE PRECISION NOT NULL,
+  max_lat DOUBLE PRECISION NOT NULL
+);
+
+CREATE TABLE constituency_shapes (
+  level SMALLINT NOT NULL REFERENCES constituency_shape_levels(level) ON DELETE CASCADE,
+  constituency_id VARCHAR(50) NOT NULL REFERENCES constituencies(id) ON DELETE CASCADE,
+  geojson TEXT NOT NULL,
+  PRIMARY KEY (level, constituency_id)
+);
+
+-- ============================================================================
+-- FUNCTIONS & TRIGGERS
+-- ============================================================================
+
+-- Recompute extents and every shape level (coverage simplification needs
+-- all polygons at once; there are only a few hundred)
+CREATE OR REPLACE FUNCTION refresh_constituency_boundaries()
+RETURNS VOID AS $$
+DECLARE
+  v_level RECORD;
+BEGIN
+  DELETE FROM constituency_extents;
+  INSERT INTO constituency_extents (constituency_id, min_lng, min_lat, max_lng, max_lat)
+  SELECT id, ST_XMin(extent), ST_YMin(extent), ST_XMax(extent), ST_YMax(extent)
+  FROM (
+    SELECT id, ST_Extent(bounds::geometry) AS extent
+    FROM constituencies
+    WHERE bounds IS NOT NULL
+    GROUP BY id
+  ) e;
+
+  DELETE FROM constituency_shapes;
+  FOR v_level IN SELECT level, tolerance FROM constituency_shape_levels ORDER BY level LOOP
+    BEGIN
+      INSERT INTO constituency_shapes (level, constituency_id, geojson)
+      SELECT v_level.level, id, ST_AsGeoJSON(geom, 5)
+      FROM (
+        SELECT id, ST_CoverageSimplify(bounds::geometry, v_level.tolerance) OVER () AS geom
+        FROM constituencies
+        WHERE bounds IS NOT NULL
+      ) s;
+    EXCEPTION WHEN OTHERS THEN
+      -- GEOS < 3.12 or an invalid coverage: simplify each polygon on its
+      -- own (rings stay valid, shared edges may no longer line up exactly)
+      RAISE NOTICE 'Coverage simplification failed (%), simplifying per polygon', SQLERRM;
+      INSERT INTO constituency_shapes (level, constituency_id, geojson)
+      SELECT v_level.level, id, ST_AsGeoJSON(ST_SimplifyPreserveTopology(bounds::geometry, v_level.tolerance), 5)
+      FROM constituencies
+      WHERE bounds IS NOT NULL;
+    END;
+  END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION constituency_boundaries_on_change()
+RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM refresh_constituency_boundaries();
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS refresh_constituency_boundaries ON constituencies;
+CREATE TRIGGER refresh_constituency_boundaries
+  AFTER INSERT OR UPDATE OF bounds OR DELETE ON constituencies
+  FOR EACH STATEMENT EXECUTE FUNCTION constituency_boundaries_on_change();
+
+-- ============================================================================
+-- BACKFILL
+-- ============================================================================
+
+SELECT refresh_constituency_boundaries();
+
+-- ============================================================================
+-- CONSTITUENCY BOUNDARIES COMPLETE
+-- ============================================================================
@@ -0,0 +1,89 @@
+-- ============================================================================
+-- Nepal Elections 2026 - Table Versions
+-- Run after 006_change_notify.sql
+--
+-- One row per cacheable table, bumped once per statement that actually
+-- changes rows. The API builds ETags / Last-Modified from these versions,
+-- so a conditional request is answered without touching the data.
+-- Statement triggers (not row triggers) keep bulk writes to one bump, and
+-- the transition-table check skips no-op statements such as an RSVP fold
+-- with nothing to fold. rsvps is deliberately not versioned here: every
+-- RSVP would contend on one row; per-user RSVP state is fingerprinted by
+-- the API instead.
+-- ============================================================================
+
+DROP TABLE IF EXISTS table_versions CASCADE;
+
+CREATE TABLE table_versions (
+  table_name TEXT PRIMARY KEY,
+  version BIGINT NOT NULL DEFAULT 1,
+  changed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO table_versions (table_name)
+VALUES ('parties'), ('constituencies'), ('venues'), ('events'), ('event_tags');
+
+-- ============================================================================
+-- FUNCTIONS & TRIGGERS
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION bump_table_version(p_table TEXT)
+RETURNS VOID AS $$
+BEGIN
+  INSERT INTO table_versions (table_name) VALUES (p_table)
+  ON CONFLICT (table_name) DO UPDATE
+  SET version = table_versions.version + 1, changed_at = NOW();
+  PERFORM pg_notify('table_changed', p_table);
+END;
+$$ LANGUAGE plpgsql;
+
+-- INSERT / UPDATE / DELETE: the transition table is always named "changed"
+CREATE OR REPLACE FUNCTION bump_table_version_on_rows()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM changed) THEN
+    PERFORM bump_table_version(TG_TABLE_NAME);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION bump_table_version_on_truncate()
+RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM bump_table_version(TG_TABLE_NAME);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables allow only one event per trigger, hence four each
+DO $$
+DECLARE
+  v_table TEXT;
+BEGIN
+  FOREACH v_table IN ARRAY ARRAY['parties', 'constituencies', 'venues', 'events', 'event_tags'] LOOP
+    EXECUTE format('DROP TRIGGER IF EXISTS version_%1$s_insert ON %1$I', v_table);
+    EXECUTE format('CREATE TRIGGER version_%1$s_insert AFTER INSERT ON %1$I
+      REFERENCING NEW TABLE AS changed
+      FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version_on_rows()', v_table);
+
+    EXECUTE format('DROP TRIGGER IF EXISTS version_%1$s_update ON %1$I', v_table);
+    EXECUTE format('CREATE TRIGGER version_%1$s_update AFTER UPDATE ON %1$I
+      REFERENCING NEW TABLE AS changed
+      FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version_on_rows()', v_table);
+
+    EXECUTE format('DROP TRIGGER IF EXISTS version_%1$s_delete ON %1$I', v_table);
+    EXECUTE format('CREATE TRIGGER version_%1$s_delete AFTER DELETE ON %1$I
+      REFERENCING OLD TABLE AS changed
+      FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version_on_rows()', v_table);
+
+    EXECUTE format('DROP TRIGGER IF EXISTS version_%1$s_truncate ON %1$I', v_table);
+    EXECUTE format('CREATE TRIGGER version_%1$s_truncate AFTER TRUNCATE ON %1$I
+      FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version_on_truncate()', v_table);
+  END LOOP;
+END;
+$$;
+
+-- ============================================================================
+-- TABLE VERSIONS COMPLETE
+-- ============================================================================
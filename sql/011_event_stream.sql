@@ -0,0 +1,89 @@
+-- ============================================================================
+-- Nepal Elections 2026 - Event Stream Notifications
+-- Run after 008_rsvp_counters.sql
+--
+-- Every committed change to an event's live state sends
+--   NOTIFY event_changed, '{"id": ..., "rsvp_count": ..., "status": ..., ...}'
+-- which each API worker fans out to its stream subscribers. RSVP counts
+-- reach events through the batched fold (008), so a burst of RSVPs on one
+-- event becomes one notification per fold rather than one per RSVP; a
+-- NOTIFY from the rsvps trigger itself would serialize every RSVP commit
+-- on the notification queue lock. Statement triggers send one message per
+-- changed row, and only when rsvp_count, status or datetime changed.
+-- ============================================================================
+
+-- ============================================================================
+-- FUNCTIONS & TRIGGERS
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION event_change_payload(
+  p_id TEXT, p_rsvp_count INTEGER, p_status TEXT, p_datetime TIMESTAMPTZ,
+  p_party_id TEXT, p_constituency_id TEXT
+)
+RETURNS TEXT AS $$
+  SELECT json_build_object(
+    'id', p_id,
+    'rsvp_count', p_rsvp_count,
+    'status', p_status,
+    'datetime', p_datetime,
+    'party_id', p_party_id,
+    'constituency_id', p_constituency_id
+  )::text
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION notify_events_inserted()
+RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM pg_notify('event_changed', event_change_payload(
+    n.id, n.rsvp_count, n.status::text, n.datetime, n.party_id, n.constituency_id
+  ))
+  FROM new_rows n;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION notify_events_updated()
+RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM pg_notify('event_changed', event_change_payload(
+    n.id, n.rsvp_count, n.status::text, n.datetime, n.party_id, n.constituency_id
+  ))
+  FROM new_rows n
+  JOIN old_rows o ON o.id = n.id
+  WHERE n.rsvp_count IS DISTINCT FROM o.rsvp_count
+     OR n.status IS DISTINCT FROM o.status
+     OR n.datetime IS DISTINCT FROM o.datetime;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Deleted events are announced with status 'deleted'
+CREATE OR REPLACE FUNCTION notify_events_deleted()
+RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM pg_notify('event_changed', event_change_payload(
+    o.id, o.rsvp_count, 'deleted', o.datetime, o.party_id, o.constituency_id
+  ))
+  FROM old_rows o;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS stream_events_insert ON events;
+CREATE TRIGGER stream_events_insert AFTER INSERT ON events
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION notify_events_inserted();
+
+DROP TRIGGER IF EXISTS stream_events_update ON events;
+CREATE TRIGGER stream_events_update AFTER UPDATE ON events
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION notify_events_updated();
+
+DROP TRIGGER IF EXISTS stream_events_delete ON events;
+CREATE TRIGGER stream_events_delete AFTER DELETE ON events
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION notify_events_deleted();
+
+-- ============================================================================
+-- EVENT STREAM NOTIFICATIONS COMPLETE
+-- ============================================================================
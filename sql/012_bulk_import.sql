@@ -0,0 +1,68 @@
+-- ============================================================================
+-- Nepal Elections 2026 - Bulk Import
+-- Run after 007_event_read_model.sql
+--
+-- A bulk import sets the transaction-local setting app.bulk_load = 'on'.
+-- The per-row read-model and search triggers then skip themselves (their
+-- WHEN clause is checked before any PL/pgSQL runs), and the importer
+-- refreshes events_read and event_search once, set-wise, for every event
+-- it touched. Other sessions are unaffected. The updated_at, version and
+-- stream triggers still fire, so caches and live clients see the import.
+-- ============================================================================
+
+-- ============================================================================
+-- FUNCTIONS
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION bulk_load_active()
+RETURNS BOOLEAN AS $$
+  SELECT COALESCE(current_setting('app.bulk_load', true), '') = 'on'
+$$ LANGUAGE sql STABLE;
+
+-- What the skipped row triggers would have done, for many events at once
+CREATE OR REPLACE FUNCTION bulk_refresh_events(p_event_ids VARCHAR(50)[])
+RETURNS VOID AS $$
+BEGIN
+  PERFORM refresh_events_read(p_event_ids);
+  PERFORM refresh_event_search(p_event_ids);
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- TRIGGERS
+-- ============================================================================
+-- Same definitions as 005 / 007, plus the bulk-load guard
+
+DROP TRIGGER IF EXISTS refresh_event_search_on_event ON events;
+CREATE TRIGGER refresh_event_search_on_event
+  AFTER INSERT OR UPDATE OF title, title_nepali, description, speakers, venue_id ON events
+  FOR EACH ROW WHEN (NOT bulk_load_active())
+  EXECUTE FUNCTION event_search_on_event_change();
+
+DROP TRIGGER IF EXISTS refresh_event_search_on_venue ON venues;
+CREATE TRIGGER refresh_event_search_on_venue
+  AFTER UPDATE OF name, name_nepali ON venues
+  FOR EACH ROW WHEN (NOT bulk_load_active())
+  EXECUTE FUNCTION event_search_on_venue_change();
+
+DROP TRIGGER IF EXISTS refresh_events_read_on_event ON events;
+CREATE TRIGGER refresh_events_read_on_event
+  AFTER INSERT OR UPDATE OR DELETE ON events
+  FOR EACH ROW WHEN (NOT bulk_load_active())
+  EXECUTE FUNCTION events_read_on_event_change();
+
+DROP TRIGGER IF EXISTS refresh_events_read_on_tag ON event_tags;
+CREATE TRIGGER refresh_events_read_on_tag
+  AFTER INSERT OR UPDATE OR DELETE ON event_tags
+  FOR EACH ROW WHEN (NOT bulk_load_active())
+  EXECUTE FUNCTION events_read_on_tag_change();
+
+DROP TRIGGER IF EXISTS refresh_events_read_on_venue ON venues;
+CREATE TRIGGER refresh_events_read_on_venue
+  AFTER UPDATE OF name, address, location ON venues
+  FOR EACH ROW WHEN (NOT bulk_load_active())
+  EXECUTE FUNCTION events_read_on_venue_change();
+
+-- ============================================================================
+-- BULK IMPORT COMPLETE
+-- ============================================================================
@@ -0,0 +1,154 @@
+-- ============================================================================
+-- Nepal Elections 2026 - Event Statistics Rollup
+-- Run after 010_table_versions.sql
+--
+-- event_stats holds event and 'going' RSVP counts per Nepal calendar day,
+-- once for all events, once per party and once per constituency. Events
+-- are counted as the default event list counts them (status confirmed);
+-- drafts and completed events are in neither events nor cancelled. The
+-- stats endpoints read only these rows, whose number grows with parties,
+-- constituencies and campaign days, never with events or RSVPs.
+--
+-- Statement triggers on events apply the difference between the old and
+-- new rows, so a bulk write or an RSVP fold is one batched upsert. RSVPs
+-- reach the rollup through events.rsvp_count: the fold (008) updates it,
+-- and that update is applied like any other. RSVP writes themselves never
+-- touch event_stats, and the counts trail them by one fold interval.
+-- ============================================================================
+
+DROP TABLE IF EXISTS event_stats CASCADE;
+
+CREATE TABLE event_stats (
+  scope VARCHAR(20) NOT NULL,           -- 'all', 'party' or 'constituency'
+  key VARCHAR(50) NOT NULL,             -- party / constituency id; '' for 'all' and for unassigned events
+  day DATE NOT NULL,                    -- event date in Asia/Kathmandu
+  events INTEGER NOT NULL DEFAULT 0,    -- confirmed
+  cancelled INTEGER NOT NULL DEFAULT 0,
+  going INTEGER NOT NULL DEFAULT 0,     -- sum of events.rsvp_count
+  PRIMARY KEY (scope, key, day)
+);
+
+-- ============================================================================
+-- FUNCTIONS
+-- ============================================================================
+
+-- The rollup rows one event adds to (p_sign = 1) or removes from (-1)
+CREATE OR REPLACE FUNCTION event_stats_rows(e events, p_sign INTEGER)
+RETURNS TABLE (scope VARCHAR, key VARCHAR, day DATE, events INTEGER, cancelled INTEGER, going INTEGER) AS $$
+  SELECT k.scope, k.key,
+         (e.datetime AT TIME ZONE 'Asia/Kathmandu')::date,
+         p_sign * (e.status = 'confirmed')::int,
+         p_sign * (e.status = 'cancelled')::int,
+         p_sign * COALESCE(e.rsvp_count, 0)
+  FROM (VALUES
+    ('all'::varchar, ''::varchar),
+    ('party', COALESCE(e.party_id, '')),
+    ('constituency', COALESCE(e.constituency_id, ''))
+  ) k(scope, key);
+$$ LANGUAGE sql STABLE;
+
+-- Replace the old versions of rows with the new ones. Rows are upserted in
+-- key order, so concurrent writers lock shared rows in the same order.
+CREATE OR REPLACE FUNCTION apply_event_stats(p_new events[], p_old events[])
+RETURNS VOID AS $$
+  INSERT INTO event_stats AS s (scope, key, day, events, cancelled, going)
+  SELECT c.scope, c.key, c.day, SUM(c.events), SUM(c.cancelled), SUM(c.going)
+  FROM (
+    SELECT r.* FROM unnest(p_new) n CROSS JOIN LATERAL event_stats_rows(n, 1) r
+    UNION ALL
+    SELECT r.* FROM unnest(p_old) o CROSS JOIN LATERAL event_stats_rows(o, -1) r
+  ) c
+  GROUP BY c.scope, c.key, c.day
+  HAVING SUM(c.events) <> 0 OR SUM(c.cancelled) <> 0 OR SUM(c.going) <> 0
+  ORDER BY c.scope, c.key, c.day
+  ON CONFLICT (scope, key, day) DO UPDATE
+  SET events = s.events + EXCLUDED.events,
+      cancelled = s.cancelled + EXCLUDED.cancelled,
+      going = s.going + EXCLUDED.going;
+$$ LANGUAGE sql;
+
+-- Transition tables are named new_rows / old_rows, as far as the event has them
+CREATE OR REPLACE FUNCTION event_stats_on_event_change()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    PERFORM apply_event_stats(ARRAY(SELECT n::events FROM new_rows n), '{}');
+  ELSIF TG_OP = 'DELETE' THEN
+    PERFORM apply_event_stats('{}', ARRAY(SELECT o::events FROM old_rows o));
+  ELSE
+    -- Only rows whose counted columns changed
+    PERFORM apply_event_stats(
+      ARRAY(SELECT n::events FROM new_rows n JOIN old_rows o ON o.id = n.id
+            WHERE (n.datetime, n.party_id, n.constituency_id, n.status, n.rsvp_count)
+                  IS DISTINCT FROM (o.datetime, o.party_id, o.constituency_id, o.status, o.rsvp_count)),
+      ARRAY(SELECT o::events FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE (n.datetime, n.party_id, n.constituency_id, n.status, n.rsvp_count)
+                  IS DISTINCT FROM (o.datetime, o.party_id, o.constituency_id, o.status, o.rsvp_count))
+    );
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Rebuild every row from events (repair, and after loads that pause triggers).
+-- The lock makes concurrent event writes wait and apply their change on top.
+CREATE OR REPLACE FUNCTION rebuild_event_stats()
+RETURNS VOID AS $$
+BEGIN
+  LOCK TABLE event_stats IN EXCLUSIVE MODE;
+  DELETE FROM event_stats;
+  INSERT INTO event_stats (scope, key, day, events, cancelled, going)
+  SELECT r.scope, r.key, r.day, SUM(r.events), SUM(r.cancelled), SUM(r.going)
+  FROM events e
+  CROSS JOIN LATERAL event_stats_rows(e, 1) r
+  GROUP BY r.scope, r.key, r.day;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- TRIGGERS
+-- ============================================================================
+
+DROP TRIGGER IF EXISTS event_stats_on_insert ON events;
+CREATE TRIGGER event_stats_on_insert AFTER INSERT ON events
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION event_stats_on_event_change();
+
+DROP TRIGGER IF EXISTS event_stats_on_update ON events;
+CREATE TRIGGER event_stats_on_update AFTER UPDATE ON events
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION event_stats_on_event_change();
+
+DROP TRIGGER IF EXISTS event_stats_on_delete ON events;
+CREATE TRIGGER event_stats_on_delete AFTER DELETE ON events
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION event_stats_on_event_change();
+
+-- Versioned like the tables in 010, so stats responses get ETags
+INSERT INTO table_versions (table_name) VALUES ('event_stats')
+ON CONFLICT (table_name) DO NOTHING;
+
+DROP TRIGGER IF EXISTS version_event_stats_insert ON event_stats;
+CREATE TRIGGER version_event_stats_insert AFTER INSERT ON event_stats
+  REFERENCING NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version_on_rows();
+
+DROP TRIGGER IF EXISTS version_event_stats_update ON event_stats;
+CREATE TRIGGER version_event_stats_update AFTER UPDATE ON event_stats
+  REFERENCING NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version_on_rows();
+
+DROP TRIGGER IF EXISTS version_event_stats_delete ON event_stats;
+CREATE TRIGGER version_event_stats_delete AFTER DELETE ON event_stats
+  REFERENCING OLD TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version_on_rows();
+
+-- ============================================================================
+-- BACKFILL
+-- ============================================================================
+
+SELECT rebuild_event_stats();
+
+-- ============================================================================
+-- EVENT STATISTICS COMPLETE
+-- ============================================================================
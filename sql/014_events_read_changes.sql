@@ -0,0 +1,73 @@
+-- ============================================================================
+-- Nepal Elections 2026 - Event Read Model Change Log
+-- Run after 007_event_read_model.sql
+--
+-- Every statement that writes events_read appends one row: the ids it
+-- touched and the writing transaction's id. The API's upcoming-events
+-- snapshot keeps the xmin of the snapshot it last read with, and on each
+-- refresh re-reads the events touched by any transaction at or above it,
+-- i.e. every transaction that had not finished by that read. Unlike
+-- updated_at (the transaction's start time), this cannot miss a long
+-- transaction that commits late, and deleted events show up as ids that
+-- are no longer in events_read.
+-- ============================================================================
+
+DROP TABLE IF EXISTS events_read_changes CASCADE;
+
+CREATE TABLE events_read_changes (
+  id BIGSERIAL PRIMARY KEY,
+  xid XID8 NOT NULL DEFAULT pg_current_xact_id(),
+  event_ids VARCHAR(50)[] NOT NULL,
+  recorded_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+);
+
+CREATE INDEX idx_events_read_changes_xid ON events_read_changes(xid);
+
+-- ============================================================================
+-- FUNCTIONS & TRIGGERS
+-- ============================================================================
+
+-- INSERT / UPDATE / DELETE: the transition table is always named "changed"
+CREATE OR REPLACE FUNCTION log_events_read_changes()
+RETURNS TRIGGER AS $$
+BEGIN
+  INSERT INTO events_read_changes (event_ids)
+  SELECT array_agg(DISTINCT id) FROM changed
+  HAVING COUNT(*) > 0;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Rows every reader has had a chance to see: from finished transactions,
+-- and older than any snapshot refresh (readers rebuild more often)
+CREATE OR REPLACE FUNCTION prune_events_read_changes(p_retention INTERVAL DEFAULT '1 hour')
+RETURNS INTEGER AS $$
+DECLARE
+  v_removed INTEGER;
+BEGIN
+  DELETE FROM events_read_changes
+  WHERE recorded_at < clock_timestamp() - p_retention
+    AND xid < pg_snapshot_xmin(pg_current_snapshot());
+  GET DIAGNOSTICS v_removed = ROW_COUNT;
+  RETURN v_removed;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS log_events_read_insert ON events_read;
+CREATE TRIGGER log_events_read_insert AFTER INSERT ON events_read
+  REFERENCING NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION log_events_read_changes();
+
+DROP TRIGGER IF EXISTS log_events_read_update ON events_read;
+CREATE TRIGGER log_events_read_update AFTER UPDATE ON events_read
+  REFERENCING NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION log_events_read_changes();
+
+DROP TRIGGER IF EXISTS log_events_read_delete ON events_read;
+CREATE TRIGGER log_events_read_delete AFTER DELETE ON events_read
+  REFERENCING OLD TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION log_events_read_changes();
+
+-- ============================================================================
+-- EVENT READ MODEL CHANGE LOG COMPLETE
+-- ============================================================================
@@ -0,0 +1,42 @@
+-- ============================================================================
+-- Nepal Elections 2026 - Per-User Change Notifications
+-- Run after 006_change_notify.sql
+--
+-- Writes to a users row send
+--   NOTIFY user_changed, '<user id>'
+-- instead of table_changed 'users', so API workers drop just that user from
+-- their user cache rather than every signed-in user's entry.
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION update_users_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+  NEW.updated_at = NOW();
+  PERFORM pg_notify('user_changed', OLD.id);
+  IF NEW.id IS DISTINCT FROM OLD.id THEN
+    PERFORM pg_notify('user_changed', NEW.id);
+  END IF;
+  RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION notify_user_deleted()
+RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM pg_notify('user_changed', OLD.id);
+  RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- Replaces the shared update_updated_at_column() trigger from 001 / 006
+DROP TRIGGER IF EXISTS update_users_updated_at ON users;
+CREATE TRIGGER update_users_updated_at BEFORE UPDATE ON users
+  FOR EACH ROW EXECUTE FUNCTION update_users_updated_at();
+
+DROP TRIGGER IF EXISTS notify_user_deleted ON users;
+CREATE TRIGGER notify_user_deleted AFTER DELETE ON users
+  FOR EACH ROW EXECUTE FUNCTION notify_user_deleted();
+
+-- ============================================================================
+-- PER-USER CHANGE NOTIFICATIONS COMPLETE
+-- ============================================================================
@@ -196,6 +196,13 @@ function toCamelCase(obj) {
   return obj;
 }
 
+// Lists default to upcoming events, which the API serves from its in-memory
+// snapshot. Rounded up to the minute so the URL (and its cached response)
+// stays the same for a minute, and never falls before the snapshot horizon.
+function upcomingFrom() {
+  return new Date(Math.ceil(Date.now() / 60000) * 60000).toISOString();
+}
+
 export const api = {
   // --------------------------------------------------------------------------
   // Events
@@ -203,7 +210,7 @@ export const api = {
   events: {
     async list(filters = {}) {
       const response = await request('GET', '/events', { 
-        params: transformParams(filters)
+        params: transformParams({ dateFrom: upcomingFrom(), ...filters })
         // Remove auth: false to include auth when available
       });
       return toCamelCase(response);
@@ -211,18 +218,33 @@ export const api = {
 
     async nearby(params) {
       const response = await request('GET', '/events/nearby', { 
-        params: transformParams(params)
+        params: transformParams({ status: 'confirmed', dateFrom: upcomingFrom(), ...params })
         // Remove auth: false to include auth when available
       });
       return toCamelCase(response);
     },
 
+    async suggest(q, limit = 8) {
+      const response = await request('GET', '/events/suggest', {
+        params: { q, limit },
+        auth: false
+      });
+      return toCamelCase(response).data;
+    },
+
     async get(id) {
       const response = await request('GET', `/events/${id}`);
       // Remove auth: false to include auth when available
       return toCamelCase(response);
     },
 
+    async batch(ids) {
+      const response = await request('POST', '/events/batch', {
+        body: { ids }
+      });
+      return toCamelCase(response);
+    },
+
     async rsvp(id, status = 'going') {
       const response = await request('POST', `/events/${id}/rsvp`, { 
         body: { status }, 
@@ -234,6 +256,43 @@ export const api = {
     async cancelRsvp(id) {
       await request('DELETE', `/events/${id}/rsvp`, { auth: true });
     },
+
+    /**
+     * Download URL for a full NDJSON/CSV export with list() filters.
+     * Pass afterId (the last id received) to resume an interrupted export.
+     */
+    exportUrl(format = 'ndjson', params = {}) {
+      const url = new URL(`${CONFIG.baseUrl}/events/export`,
+        typeof window !== 'undefined' ? window.location.origin : 'http://localhost:3000');
+      url.searchParams.set('format', format);
+      Object.entries(transformParams(params)).forEach(([key, value]) => {
+        if (value !== undefined && value !== null) url.searchParams.set(key, String(value));
+      });
+      return url.toString();
+    },
+
+    /**
+     * Live rsvp_count / status changes over server-sent events.
+     * onChanges receives camelCased event states; onResync means updates
+     * were missed and the caller should refetch. Returns the EventSource
+     * (call .close() to unsubscribe).
+     */
+    stream({ ids, partyId, constituencyId } = {}, { onChanges, onResync } = {}) {
+      const url = new URL(`${CONFIG.baseUrl}/events/stream`,
+        typeof window !== 'undefined' ? window.location.origin : 'http://localhost:3000');
+      if (ids && ids.length) url.searchParams.set('ids', ids.join(','));
+      if (partyId) url.searchParams.set('party_id', partyId);
+      if (constituencyId) url.searchParams.set('constituency_id', constituencyId);
+
+      const source = new EventSource(url.toString());
+      source.addEventListener('changes', (message) => {
+        if (onChanges) onChanges(toCamelCase(JSON.parse(message.data)));
+      });
+      source.addEventListener('resync', () => {
+        if (onResync) onResync();
+      });
+      return source;
+    },
   },
 
   // --------------------------------------------------------------------------
@@ -268,6 +327,14 @@ export const api = {
       return toCamelCase(response);
     },
 
+    // Simplified polygons for the map zoom (GeoJSON FeatureCollection or TopoJSON)
+    async boundaries(zoom, format = 'geojson') {
+      return request('GET', '/constituencies/boundaries', {
+        params: { zoom, format },
+        auth: false
+      });
+    },
+
     async detect(lat, lng) {
       try {
         const response = await request('GET', '/constituencies/detect', { 
@@ -282,6 +349,31 @@ export const api = {
         throw error;
       }
     },
+
+    async detectBatch(points) {
+      const response = await request('POST', '/constituencies/detect/batch', {
+        body: { points },
+        auth: false
+      });
+      return {
+        data: response.data,
+        constituencies: toCamelCase(response.constituencies),
+      };
+    },
+  },
+
+  // --------------------------------------------------------------------------
+  // Map
+  // --------------------------------------------------------------------------
+  map: {
+    // { z, x, y } for a tile or { z, bbox: [minLng, minLat, maxLng, maxLat] }
+    async clusters({ bbox, ...params }) {
+      const response = await request('GET', '/map/clusters', {
+        params: transformParams({ ...params, ...(bbox && { bbox: bbox.join(',') }) }),
+        auth: false
+      });
+      return toCamelCase(response);
+    },
   },
 
   // --------------------------------------------------------------------------
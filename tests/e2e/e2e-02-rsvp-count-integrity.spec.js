@@ -112,4 +112,43 @@ test.describe('E2E-02: RSVP Count Integrity Under Multiple Users', () => {
     event = await response.json();
     expect(event.rsvp_count).toBe(initialCount + 3);
   });
+
+  test('should move the count with going -> interested -> going', async ({ page }) => {
+    const listResponse = await page.request.get(`http://localhost:5012/v1/events?per_page=1`);
+    expect(listResponse.ok()).toBeTruthy();
+    const eventId = (await listResponse.json()).data[0].id;
+
+    const phone = `+977981${Math.random().toString().slice(2, 10)}`;
+    await page.request.post(`http://localhost:5012/v1/auth/request-otp`, {
+      data: { phone }
+    });
+    const verifyResponse = await page.request.post(`http://localhost:5012/v1/auth/verify-otp`, {
+      data: { phone, otp: testOTP }
+    });
+    expect(verifyResponse.ok()).toBeTruthy();
+    const token = (await verifyResponse.json()).access_token;
+
+    const initialResponse = await page.request.get(`http://localhost:5012/v1/events/${eventId}`);
+    const initialCount = (await initialResponse.json()).rsvp_count;
+
+    // Only 'going' counts; both the RSVP response and an immediate read
+    // must be exact, before and after the background counter fold
+    for (const [status, expected] of [['going', 1], ['interested', 0], ['going', 1]]) {
+      const rsvpResponse = await page.request.post(`http://localhost:5012/v1/events/${eventId}/rsvp`, {
+        headers: { Authorization: `Bearer ${token}` },
+        data: { status }
+      });
+      expect(rsvpResponse.ok()).toBeTruthy();
+      const rsvpEvent = await rsvpResponse.json();
+      expect(rsvpEvent.user_rsvp).toBe(status);
+      expect(rsvpEvent.rsvp_count).toBe(initialCount + expected);
+
+      let response = await page.request.get(`http://localhost:5012/v1/events/${eventId}`);
+      expect((await response.json()).rsvp_count).toBe(initialCount + expected);
+
+      await page.waitForTimeout(1500);
+      response = await page.request.get(`http://localhost:5012/v1/events/${eventId}`);
+      expect((await response.json()).rsvp_count).toBe(initialCount + expected);
+    }
+  });
 });
@@ -0,0 +1,87 @@
+import { test, expect } from '@playwright/test';
+
+// Golden test for render=db: Postgres-built JSON must match the Python
+// serializers field for field, for every projection and for guests and
+// signed-in users alike.
+test.describe('E2E-08: Render Mode Equivalence', () => {
+  const API = 'http://localhost:5012/v1';
+
+  const listUrls = [
+    '/events',
+    '/events?per_page=100',
+    '/events?sort=-rsvp_count&per_page=50',
+    '/events?status=',
+    '/events?view=card',
+    '/events?view=map&per_page=100',
+    '/events?fields=id,title,venue,party,constituency,tags,user_rsvp',
+    '/events?fields=datetime,end_time,speakers',
+    '/events?search=rally',
+    '/events?count=none&per_page=5',
+    '/parties/nc/events',
+    '/parties/nc/events?view=card',
+  ];
+
+  async function fetchBoth(request, url, headers = {}) {
+    const separator = url.includes('?') ? '&' : '?';
+    const [python, db] = await Promise.all([
+      request.get(`${API}${url}${separator}render=python`, { headers }),
+      request.get(`${API}${url}${separator}render=db`, { headers }),
+    ]);
+    expect(python.ok()).toBeTruthy();
+    expect(db.ok()).toBeTruthy();
+    return [await python.json(), await db.json()];
+  }
+
+  test('guest list responses are identical in both modes', async ({ page }) => {
+    for (const url of listUrls) {
+      const [python, db] = await fetchBoth(page.request, url);
+      expect(db, url).toEqual(python);
+      // Key order is part of the format
+      if (python.data.length > 0 && !Array.isArray(python.data[0])) {
+        expect(Object.keys(db.data[0]), url).toEqual(Object.keys(python.data[0]));
+      }
+    }
+  });
+
+  test('user_rsvp overlay is identical in both modes', async ({ page }) => {
+    const phone = `+977982${Math.random().toString().slice(2, 10)}`;
+    await page.request.post(`${API}/auth/request-otp`, { data: { phone } });
+    const verify = await page.request.post(`${API}/auth/verify-otp`, {
+      data: { phone, otp: '123456' }
+    });
+    expect(verify.ok()).toBeTruthy();
+    const { access_token: token } = await verify.json();
+    const headers = { Authorization: `Bearer ${token}` };
+
+    // RSVP to the first event so the overlay has something to show
+    const first = await (await page.request.get(`${API}/events?per_page=1`)).json();
+    const eventId = first.data[0].id;
+    const rsvp = await page.request.post(`${API}/events/${eventId}/rsvp`, {
+      headers,
+      data: { status: 'interested' }
+    });
+    expect(rsvp.ok()).toBeTruthy();
+
+    for (const url of ['/events', '/events?fields=id,user_rsvp', '/events?view=card']) {
+      const [python, db] = await fetchBoth(page.request, url, headers);
+      expect(db, url).toEqual(python);
+    }
+
+    const [python] = await fetchBoth(page.request, '/events', headers);
+    const rsvped = python.data.find((event) => event.id === eventId);
+    expect(rsvped.user_rsvp).toBe('interested');
+
+    await page.request.delete(`${API}/events/${eventId}/rsvp`, { headers });
+  });
+
+  test('cursor pages match in both modes', async ({ page }) => {
+    const [python, db] = await fetchBoth(page.request, '/events?per_page=3');
+    expect(db.pagination.next_cursor).toBe(python.pagination.next_cursor);
+
+    if (python.pagination.next_cursor) {
+      const cursor = encodeURIComponent(python.pagination.next_cursor);
+      const [nextPython, nextDb] = await fetchBoth(page.request, `/events?per_page=3&cursor=${cursor}`);
+      expect(nextDb).toEqual(nextPython);
+    }
+  });
+});